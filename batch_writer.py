@@ -0,0 +1,59 @@
+"""
+batch_writer.py — буферизованная запись строк в файл из фонового потока.
+
+Рабочие потоки только кладут строку в очередь (без блокировок на файл),
+фоновый поток пишет их пачками: по batch_size строк или раз в
+flush_interval секунд — что наступит раньше.
+
+    writer = BatchedLineWriter("journal.jsonl", mode="a")
+    writer.write(json.dumps(record))
+    writer.close()   # дописывает остаток и закрывает файл
+"""
+
+import queue
+import threading
+
+_CLOSE = object()
+
+
+class BatchedLineWriter:
+    def __init__(self, path, mode="a", batch_size=1000, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lines_written = 0
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, mode, encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name=f"writer:{path}", daemon=True)
+        self._thread.start()
+
+    def write(self, line):
+        """Ставит строку в очередь на запись (перевод строки добавляется сам)"""
+        self._queue.put(line)
+
+    def _run(self):
+        closing = False
+        while not closing:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                while True:
+                    if item is _CLOSE:
+                        closing = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch:
+                self._file.write("\n".join(batch) + "\n")
+                self._file.flush()
+                self.lines_written += len(batch)
+        self._file.close()
+
+    def close(self):
+        """Дописывает всё из очереди и закрывает файл"""
+        self._queue.put(_CLOSE)
+        self._thread.join()
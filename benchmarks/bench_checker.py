@@ -0,0 +1,130 @@
+"""
+bench_checker.py — сквозной бенчмарк swagger_checker.py на mock-ферме.
+
+Поднимает mock_farm.MockFarm на localhost, пишет swagger_endpoints.txt во
+временную папку и запускает чекер отдельным процессом для каждой пары
+движок × число потоков. Для каждого прогона:
+
+    req/s        запросов к ферме в секунду (поиск спецификаций + проверка)
+    p50/p99      задержка запроса проверки по --jsonl (total_ms)
+    RSS / CPU    пиковая память и user+sys время процесса (os.wait4)
+
+    python benchmarks/bench_checker.py --engines threads async --threads 8 32 128
+    python benchmarks/bench_checker.py --hosts oas2=8 js=4 slow=2 missing=4 catchall=2 --paths 200
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_farm import HOST_KINDS, MockFarm
+
+CHECKER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "swagger_checker.py")
+DEFAULT_HOSTS = ["oas2=4", "oas3=2", "js=2", "slow=1", "missing=2", "catchall=1"]
+
+
+def parse_hosts(items):
+    hosts = {}
+    for item in items:
+        kind, _, count = item.partition("=")
+        if kind not in HOST_KINDS:
+            raise SystemExit(f"unknown host kind {kind!r}, expected one of {', '.join(HOST_KINDS)}")
+        hosts[kind] = int(count or 1)
+    return hosts
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_checker(workdir, engine, threads, extra_args):
+    """Запускает чекер и возвращает (секунды, пиковый RSS в МБ, CPU в секундах, код выхода)"""
+    argv = [sys.executable, CHECKER, "-t", str(threads), "--engine", engine,
+            "--no-cache", "--no-journal", "-q", "--no-progress", "--jsonl", "probes.jsonl", *extra_args]
+    started = time.perf_counter()
+    process = subprocess.Popen(argv, cwd=workdir, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss в Linux — килобайты
+    return elapsed, usage.ru_maxrss / 1024, usage.ru_utime + usage.ru_stime, process.returncode
+
+
+def probe_latencies(workdir):
+    latencies = []
+    with open(os.path.join(workdir, "probes.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            total = json.loads(line).get("total_ms")
+            if total is not None:
+                latencies.append(total)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of swagger_checker.py")
+    parser.add_argument("--engines", nargs="+", default=["threads", "async"], choices=["threads", "async"])
+    parser.add_argument("--threads", nargs="+", type=int, default=[8, 32])
+    parser.add_argument("--hosts", nargs="+", default=DEFAULT_HOSTS,
+                        help=f"host kinds as kind=count ({', '.join(HOST_KINDS)})")
+    parser.add_argument("--paths", type=int, default=50, help="resources per spec (each adds 2 paths)")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="per-response delay of slow hosts, s")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per configuration (best wall time wins)")
+    parser.add_argument("--checker-args", default="--no-host-limit",
+                        help="extra checker arguments (default: --no-host-limit, so the farm is not rate limited)")
+    parser.add_argument("--json", metavar="FILE", help="also write results as JSON")
+    args = parser.parse_args()
+
+    farm = MockFarm(parse_hosts(args.hosts), paths=args.paths, slow_delay=args.slow_delay).start()
+    extra_args = args.checker_args.split()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="swagger-bench-") as workdir:
+            with open(os.path.join(workdir, "swagger_endpoints.txt"), "w") as f:
+                f.write("\n".join(farm.sources()) + "\n")
+            print(f"farm: {len(farm.hosts)} hosts ({' '.join(args.hosts)}), {args.paths * 2} paths per spec")
+            print(f"{'engine':<8} {'threads':>7} {'requests':>9} {'wall s':>8} {'req/s':>9} "
+                  f"{'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'CPU s':>7} {'hits':>6}")
+            for engine in args.engines:
+                for threads in args.threads:
+                    best = None
+                    for _ in range(args.repeat):
+                        farm.reset_counters()
+                        elapsed, rss, cpu, code = run_checker(workdir, engine, threads, extra_args)
+                        if code:
+                            print(f"{engine:<8} {threads:>7} checker exited with {code}")
+                            break
+                        latencies = probe_latencies(workdir)
+                        with open(os.path.join(workdir, "swagger_get_200.txt")) as f:
+                            hits = sum(1 for _ in f)
+                        run = {
+                            "engine": engine, "threads": threads, "requests": farm.requests(),
+                            "wall_s": elapsed, "rps": farm.requests() / elapsed,
+                            "p50_ms": percentile(latencies, 0.50), "p99_ms": percentile(latencies, 0.99),
+                            "rss_mb": rss, "cpu_s": cpu, "hits": hits,
+                        }
+                        if best is None or run["wall_s"] < best["wall_s"]:
+                            best = run
+                    if best is None:
+                        continue
+                    results.append(best)
+                    print(f"{engine:<8} {threads:>7} {best['requests']:>9} {best['wall_s']:>8.2f} {best['rps']:>9.0f} "
+                          f"{best['p50_ms']:>8.1f} {best['p99_ms']:>8.1f} {best['rss_mb']:>8.1f} "
+                          f"{best['cpu_s']:>7.2f} {best['hits']:>6}")
+    finally:
+        farm.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
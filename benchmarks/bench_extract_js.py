@@ -0,0 +1,100 @@
+"""
+bench_extract_js.py — микробенчмарк extract_swagger_from_js.
+
+Сравнивает старый посимвольный подсчёт скобок с текущим извлечением через
+json.JSONDecoder.raw_decode на синтетическом swagger-ui-init.js заданного
+размера (спецификация с фигурными скобками внутри строк).
+
+    python benchmarks/bench_extract_js.py --size-mb 8 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from swagger_checker import extract_swagger_from_js
+
+
+def legacy_extract_swagger_from_js(js_content):
+    """Прежняя реализация: посимвольный цикл по фигурным скобкам"""
+    try:
+        start_marker = '"swaggerDoc":'
+        start_idx = js_content.find(start_marker) + len(start_marker)
+        if start_idx == len(start_marker) - 1:
+            return None
+        while start_idx < len(js_content) and js_content[start_idx].isspace():
+            start_idx += 1
+        if js_content[start_idx] != '{':
+            return None
+        brace_count = 1
+        end_idx = start_idx + 1
+        while end_idx < len(js_content) and brace_count > 0:
+            if js_content[end_idx] == '{':
+                brace_count += 1
+            elif js_content[end_idx] == '}':
+                brace_count -= 1
+            end_idx += 1
+        if brace_count != 0:
+            return None
+        return json.loads(js_content[start_idx:end_idx].strip())
+    except Exception:
+        return None
+
+
+def build_bundle(size_mb, braces_in_strings):
+    """swagger-ui-init.js с одной большой встроенной спецификацией"""
+    # Непарная скобка в строке ломает посимвольный подсчёт
+    description = "Returns {id} for the given name; } closes a block" if braces_in_strings else "Returns id for the given name"
+    paths = {}
+    i = 0
+    spec = {"openapi": "3.0.0", "info": {"title": "bench"}, "paths": paths}
+    target = size_mb * 1024 * 1024
+    size = 0
+    while size < target:
+        path = f"/api/v1/resource{i}/{{id}}"
+        paths[path] = {"get": {"summary": description, "responses": {"200": {"description": "OK"}}}}
+        size += len(path) + len(description) + 140
+        i += 1
+    return (
+        "window.onload = function() {\n"
+        "  var options = {\n"
+        f'  "swaggerDoc": {json.dumps(spec, indent=2)},\n'
+        '  "customOptions": {}\n'
+        "  };\n"
+        "  SwaggerUIBundle(options);\n"
+        "};\n"
+    ), len(paths)
+
+
+def bench(fn, js, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(js)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_swagger_from_js")
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for braces_in_strings in (False, True):
+        js, n_paths = build_bundle(args.size_mb, braces_in_strings)
+        label = "braces in strings" if braces_in_strings else "plain"
+        print(f"\n== {label}: {len(js) / 1024 / 1024:.1f} MB, {n_paths} paths ==")
+        for name, fn in (("legacy", legacy_extract_swagger_from_js), ("current", extract_swagger_from_js)):
+            seconds, result = bench(fn, js, args.repeat)
+            found = len(result["paths"]) if result else 0
+            print(f"  {name:<8} {seconds * 1000:8.1f} ms   paths found: {found}")
+
+
+if __name__ == "__main__":
+    main()
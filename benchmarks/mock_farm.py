@@ -0,0 +1,158 @@
+"""
+mock_farm.py — локальная ферма mock Swagger-хостов для бенчмарков.
+
+Каждый хост — отдельный ThreadingHTTPServer на своём порту 127.0.0.1
+(для чекера это разные хосты). Виды хостов:
+
+    oas2      Swagger 2.0 на /swagger.json (basePath /api)
+    oas3      OpenAPI 3 на /openapi.json (servers: /v1)
+    js        спецификация внутри /swagger/swagger-ui-init.js
+    slow      как oas2, но каждый ответ задерживается на slow_delay
+    missing   404 на любой путь (перебор кандидатов впустую)
+    catchall  200 {"status":"ok"} на любой путь
+
+Эндпоинты спецификаций: чётные ресурсы отвечают JSON, нечётные — 404,
+у /{id} подтверждаются только id 1 и 2.
+
+    farm = MockFarm(hosts={"oas2": 4, "js": 2, "catchall": 1}, paths=50)
+    farm.start()
+    farm.sources()   # строки для swagger_endpoints.txt
+    farm.stop()
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HOST_KINDS = ("oas2", "oas3", "js", "slow", "missing", "catchall")
+
+
+def build_paths(count):
+    paths = {}
+    for i in range(count):
+        paths[f"/resource{i}"] = {"get": {"responses": {"200": {"description": "OK"}}}}
+        paths[f"/resource{i}/{{id}}"] = {
+            "get": {"parameters": [{"name": "id", "in": "path", "required": True, "type": "integer"}]},
+        }
+    return paths
+
+
+def build_spec(kind, count):
+    if kind == "oas3":
+        spec = {"openapi": "3.0.0", "info": {"title": "bench"}, "servers": [{"url": "/v1"}],
+                "paths": build_paths(count)}
+        for item in spec["paths"].values():
+            for param in item["get"].get("parameters", []):
+                param["schema"] = {"type": param.pop("type")}
+        return spec
+    return {"swagger": "2.0", "info": {"title": "bench"}, "basePath": "/api", "paths": build_paths(count)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        host = self.server.farm_host
+        host.count()
+        if host.delay:
+            time.sleep(host.delay)
+        path = self.path.split("?", 1)[0]
+        kind = host.kind
+
+        if kind == "missing":
+            return self._send(404, "not found", "text/plain")
+        if kind == "catchall" and path != "/swagger.json":
+            return self._send(200, '{"status":"ok"}')
+        if kind == "js":
+            if path == "/swagger/swagger-ui-init.js":
+                return self._send(200, host.bundle, "application/javascript")
+        elif path == ("/openapi.json" if kind == "oas3" else "/swagger.json"):
+            return self._send(200, host.spec_json)
+
+        prefix = "/v1/" if kind == "oas3" else "/api/"
+        if path.startswith(prefix + "resource"):
+            parts = path[len(prefix):].split("/")
+            index = parts[0][len("resource"):]
+            if index.isdigit() and int(index) % 2 == 0:
+                if len(parts) == 1:
+                    return self._send(200, json.dumps([{"id": 1, "resource": int(index)}]))
+                if len(parts) == 2 and parts[1] in ("1", "2"):
+                    return self._send(200, json.dumps({"id": int(parts[1]), "resource": int(index)}))
+        return self._send(404, '{"error":"not found"}')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Клиент рвёт keep-alive соединения при завершении — это не ошибка фермы
+        pass
+
+
+class FarmHost:
+    def __init__(self, kind, paths, slow_delay):
+        self.kind = kind
+        self.delay = slow_delay if kind == "slow" else 0.0
+        spec = build_spec(kind, paths)
+        self.spec_json = json.dumps(spec)
+        self.bundle = ('window.onload = function() {\n  var options = {\n'
+                       f'  "swaggerDoc": {self.spec_json},\n  "customOptions": {{}}\n  }};\n}};\n')
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        self.server.farm_host = self
+        self.port = self.server.server_address[1]
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def source(self):
+        """Строка для swagger_endpoints.txt"""
+        base = f"http://127.0.0.1:{self.port}"
+        if self.kind == "oas3":
+            return f"{base}/openapi.json"
+        if self.kind in ("oas2", "slow", "catchall"):
+            return f"{base}/swagger.json"
+        return f"{base}/swagger/index.html"
+
+
+class MockFarm:
+    def __init__(self, hosts, paths=50, slow_delay=0.05):
+        self.hosts = [FarmHost(kind, paths, slow_delay)
+                      for kind, count in hosts.items() for _ in range(count)]
+        self._threads = []
+
+    def start(self):
+        for host in self.hosts:
+            thread = threading.Thread(target=host.server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for host in self.hosts:
+            host.server.shutdown()
+            host.server.server_close()
+
+    def sources(self):
+        return [host.source() for host in self.hosts]
+
+    def requests(self):
+        return sum(host.requests for host in self.hosts)
+
+    def reset_counters(self):
+        for host in self.hosts:
+            host.requests = 0
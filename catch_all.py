@@ -0,0 +1,151 @@
+"""
+catch_all.py — распознавание хостов, отвечающих одинаковым 200 JSON на любой путь.
+
+Перед первой проверкой эндпоинта хоста запрашиваются случайные пути (baseline).
+Если все они «подтверждаются» как валидный JSON, хост считается catch-all
+(SPA fallback, {"status":"ok"} и т.п.) и остальные его эндпоинты не проверяются.
+Иначе отпечатки baseline-ответов запоминаются, и попадания, похожие на них
+(одинаковый SHA-1 или simhash с расстоянием Хэмминга ≤ SIMHASH_DISTANCE),
+отбрасываются. Попадания с телом, уже подтверждённым на этом хосте,
+схлопываются в одно. Сами повторы хост catch-all не делают: пустые списки
+и /users/1 vs /users/me у настоящих API тоже отдают одинаковые тела.
+
+    detector = CatchAllDetector()
+    if detector.claim(host):
+        detector.set_baseline(host, [body_or_None, ...])   # ответы на baseline_urls()
+    else:
+        detector.wait(host)
+    if not detector.is_catch_all(host):
+        verdict, first_url = detector.classify(host, url, body)
+"""
+
+import asyncio
+import hashlib
+import re
+import secrets
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+BASELINE_PROBES = 2
+SIMHASH_DISTANCE = 3
+SIMHASH_BYTES = 64 * 1024
+BASELINE_WAIT = 60.0
+
+VERDICT_BASELINE = "baseline"     # совпадает с ответом на случайный путь
+VERDICT_DUPLICATE = "duplicate"   # такое же тело уже подтверждено на хосте
+
+_TOKEN = re.compile(rb'\w+')
+
+
+def simhash(body):
+    """64-битный simhash по словам тела (первые SIMHASH_BYTES байт)"""
+    weights = [0] * 64
+    for token, count in Counter(_TOKEN.findall(body[:SIMHASH_BYTES])).items():
+        value = int.from_bytes(hashlib.blake2b(token, digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def fingerprint(body):
+    """(SHA-1 тела, simhash) — точное и нечёткое сравнение ответов"""
+    return hashlib.sha1(body).hexdigest(), simhash(body)
+
+
+def is_similar(a, b):
+    return a[0] == b[0] or bin(a[1] ^ b[1]).count("1") <= SIMHASH_DISTANCE
+
+
+class _HostState:
+    __slots__ = ("ready", "baseline", "catch_all", "hits")
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.baseline = []     # отпечатки baseline-ответов, оказавшихся «валидными»
+        self.catch_all = False
+        self.hits = {}         # SHA-1 тела -> первый URL с этим телом
+
+
+class CatchAllDetector:
+    """Baseline по случайным путям и отпечатки ответов на каждый хост (потокобезопасно)"""
+
+    def __init__(self, probes=BASELINE_PROBES):
+        self.probes = probes
+        self.skipped = 0
+        self.collapsed = 0
+        self.rejected = 0
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def claim(self, host):
+        """True — вызывающий первым пришёл на хост и должен снять baseline"""
+        with self._lock:
+            if host in self._hosts:
+                return False
+            self._hosts[host] = _HostState()
+            return True
+
+    def wait(self, host):
+        self._hosts[host].ready.wait(BASELINE_WAIT)
+
+    async def wait_async(self, host):
+        ready = self._hosts[host].ready
+        for _ in range(int(BASELINE_WAIT / 0.05)):
+            if ready.is_set():
+                return
+            await asyncio.sleep(0.05)
+
+    def baseline_urls(self, url):
+        """Случайные пути рядом с эндпоинтом и от корня хоста"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        parent = parsed.path.rsplit("/", 1)[0]
+        urls = [f"{origin}{parent}/{secrets.token_hex(8)}",
+                f"{origin}/{secrets.token_hex(6)}/{secrets.token_hex(6)}"]
+        return urls[:self.probes]
+
+    def set_baseline(self, host, hit_bodies):
+        """hit_bodies — тело для каждого baseline-запроса, признанного валидным JSON, иначе None"""
+        with self._lock:
+            state = self._hosts[host]
+            state.baseline = [fingerprint(body) for body in hit_bodies if body is not None]
+            state.catch_all = bool(hit_bodies) and all(body is not None for body in hit_bodies)
+        state.ready.set()
+        return state.catch_all
+
+    def is_catch_all(self, host):
+        state = self._hosts.get(host)
+        return state is not None and state.catch_all
+
+    def record_skipped(self):
+        with self._lock:
+            self.skipped += 1
+
+    def classify(self, host, url, body):
+        """Вердикт для попадания: (VERDICT_*, URL первого такого же ответа) или (None, None)"""
+        fp = fingerprint(body)
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState()
+                state.ready.set()
+            if any(is_similar(fp, known) for known in state.baseline):
+                self.rejected += 1
+                return VERDICT_BASELINE, None
+            first_url = state.hits.get(fp[0])
+            if first_url is not None and first_url != url:
+                self.collapsed += 1
+                return VERDICT_DUPLICATE, first_url
+            state.hits[fp[0]] = url
+            return None, None
+
+    def stats(self):
+        with self._lock:
+            catch_all_hosts = sum(state.catch_all for state in self._hosts.values())
+        return {
+            "catch_all_hosts": catch_all_hosts,
+            "skipped": self.skipped,
+            "rejected": self.rejected,
+            "collapsed": self.collapsed,
+        }
@@ -1,4 +1,3 @@
-import requests
 import json
 import argparse
 import threading
@@ -6,13 +5,17 @@ import os
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-print_lock = threading.Lock()
+import scan_log
+import graphql_schema
+import graphql_transport
+import http_pool
+from graphql_schema import CompiledSchema, get_named_type
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def thread_safe_print(message):
-    with print_lock:
-        print(message)
+# All output goes through the shared scan_log queue; level is an optional second argument
+thread_safe_print = scan_log.log
 
 # === Circuit Breaker ===
 _error_counts = {}      # url -> consecutive error count
@@ -34,6 +37,30 @@ def record_success(url):
     with _cb_lock:
         _error_counts[url] = 0  # reset on success
 
+# === Transport ===
+# One pooled keep-alive client shared by every mode and target, with a global
+# in-flight request budget and a per-target cap (see graphql_transport)
+_transport = None
+
+def configure_concurrency(global_limit=None, per_target=None, http2=False):
+    global _transport
+    if _transport:
+        _transport.close()
+    if http2 and not graphql_transport.HTTP2_AVAILABLE:
+        thread_safe_print("[WARN] --http2 needs httpx and h2 (pip install httpx[http2]), using HTTP/1.1")
+    _transport = graphql_transport.create(per_target, global_limit, http2)
+
+def get_transport():
+    if _transport is None:
+        configure_concurrency()
+    return _transport
+
+def close_transport():
+    global _transport
+    if _transport:
+        _transport.close()
+        _transport = None
+
 # === Auth ===
 def build_headers(args):
     headers = {
@@ -61,14 +88,16 @@ def prepare_results_folder(results_dir, mode, url):
 def post_graphql(url, query, headers, timeout=10):
     if is_dead(url):
         return None
+    scan_log.count(scan_log.REQUESTS)
     try:
-        resp = requests.post(url, headers=headers, json=query, timeout=timeout, verify=False)
+        resp = get_transport().post(url, query, headers, timeout)
         if resp.status_code == 200:
             record_success(url)
             return resp
         record_error(url)
     except Exception as e:
         thread_safe_print(f"[ERROR] {e}")
+        scan_log.count(scan_log.ERRORS)
         record_error(url)
     return None
 
@@ -134,30 +163,25 @@ def get_schema(url, headers):
             pass
     return None
 
-def get_named_type(type_obj):
-    t = type_obj
-    while t and t.get("ofType"):
-        t = t["ofType"]
-    return t.get("name") if t else None
-
-def get_fields_recursive(type_name, schema_types, visited=None, depth=0):
-    if visited is None:
-        visited = set()
-    if type_name in visited or not type_name or depth > 3:
-        return ["__typename"]
-    visited.add(type_name)
-    obj_type = next((t for t in schema_types if t["name"] == type_name and t.get("fields")), None)
-    if not obj_type:
-        return ["__typename"]
-    fields = []
-    for f in obj_type["fields"]:
-        nested = get_named_type(f["type"])
-        if nested and any(t["name"] == nested and t.get("fields") for t in schema_types):
-            nested_fields = get_fields_recursive(nested, schema_types, visited.copy(), depth + 1)
-            fields.append(f"{f['name']} {{ {' '.join(nested_fields)} }}")
-        else:
-            fields.append(f["name"])
-    return fields
+# Selection budget per generated query body (--max-query-bytes / --max-query-fields)
+max_query_bytes = graphql_schema.DEFAULT_MAX_BYTES
+max_query_fields = graphql_schema.DEFAULT_MAX_FIELDS
+
+def configure_query_budget(max_bytes=graphql_schema.DEFAULT_MAX_BYTES,
+                           max_fields=graphql_schema.DEFAULT_MAX_FIELDS):
+    global max_query_bytes, max_query_fields
+    max_query_bytes = max_bytes
+    max_query_fields = max_fields
+
+def compile_schema(url, headers, schema=None):
+    """CompiledSchema for url: reuse a compiled one, compile a raw one, or fetch introspection."""
+    if isinstance(schema, CompiledSchema):
+        return schema
+    if not schema:
+        schema = get_schema(url, headers)
+    if not schema:
+        return None
+    return CompiledSchema(schema, max_query_bytes, max_query_fields, leaf_score=leaf_score)
 
 # === PII Detection ===
 PII_KEYWORDS = [
@@ -191,44 +215,52 @@ def get_pii_severity(field_name):
             return sev
     return "Low"
 
-def find_pii_fields(schema):
+PII_LEAF_SCORE = {"Critical": 5.0, "High": 4.0, "Medium": 3.0, "Low": 2.0}
+
+def leaf_score(field_name):
+    """Selection priority of a scalar field: PII by severity, then IDs, then the rest."""
+    fname = field_name.lower()
+    if any(kw in fname for kw in PII_KEYWORDS):
+        return PII_LEAF_SCORE[get_pii_severity(field_name)]
+    if fname.endswith("id"):
+        return 1.5
+    return 1.0
+
+def find_pii_fields(compiled):
     pii_fields = []
-    for t in schema.get("types", []):
-        if t.get("fields"):
-            for f in t["fields"]:
-                if any(kw in f["name"].lower() for kw in PII_KEYWORDS):
-                    pii_fields.append({
-                        "type": t["name"],
-                        "field": f["name"],
-                        "field_type": f["type"],
-                        "severity": get_pii_severity(f["name"])
-                    })
+    for t in compiled.object_types.values():
+        for f in t["fields"]:
+            if any(kw in f["name"].lower() for kw in PII_KEYWORDS):
+                pii_fields.append({
+                    "type": t["name"],
+                    "field": f["name"],
+                    "field_type": f["type"],
+                    "severity": get_pii_severity(f["name"])
+                })
     return pii_fields
 
-def check_pii(url, headers, results_dir, threads):
+def check_pii(url, headers, results_dir, threads, schema=None):
     pii_dir = prepare_results_folder(results_dir, "pii", url)
-    schema = get_schema(url, headers)
-    if not schema:
+    compiled = compile_schema(url, headers, schema)
+    if not compiled:
         thread_safe_print(f"[ERROR] Cannot get schema for {url}")
         return []
 
-    pii_fields = find_pii_fields(schema)
-    schema_types = schema.get("types", [])
+    pii_fields = find_pii_fields(compiled)
     findings = []
 
     def run_pii_field(field):
         type_name = get_named_type(field["field_type"])
-        type_obj = next((t for t in schema_types if t["name"] == type_name and t.get("fields")), None)
-        if type_obj:
-            fb = " ".join(get_fields_recursive(type_name, schema_types))
-            query_str = f"{{ {field['field']} {{ {fb} }} }}"
+        if compiled.has_fields(type_name):
+            query_str = f"{{ {field['field']} {{ {compiled.selection(type_name)} }} }}"
         else:
             query_str = f"{{ {field['field']} }}"
         query_json = {"query": query_str}
         resp = post_graphql(url, query_json, headers)
         if is_success(resp):
             sev = field["severity"]
-            thread_safe_print(f"[{sev}] PII field accessible: {field['field']} ({url})")
+            thread_safe_print(f"[{sev}] PII field accessible: {field['field']} ({url})", scan_log.QUIET)
+            scan_log.count(scan_log.HITS)
             fname = f"{field['type']}_{field['field']}.txt"
             save_result(os.path.join(pii_dir, fname), url, query_json, resp)
             try:
@@ -240,7 +272,8 @@ def check_pii(url, headers, results_dir, threads):
 
     with ThreadPoolExecutor(max_workers=threads) as ex:
         futures = [ex.submit(run_pii_field, f) for f in pii_fields]
-        for fut in as_completed(futures):
+        # Submission (schema) order, so the report does not depend on timing
+        for fut in futures:
             res = fut.result()
             if res:
                 findings.append(res)
@@ -265,43 +298,35 @@ def guess_value(param_name):
             return values[0]
     return "1"
 
-def build_operation_query(op_name, op_args, op_type_name, schema_types):
-    arg_parts = [f"{a}: {json.dumps(guess_value(a))}" for a in op_args]
-    arg_block = f"({', '.join(arg_parts)})" if arg_parts else ""
-    fields_block = ""
-    if op_type_name:
-        fields = get_fields_recursive(op_type_name, schema_types)
-        fields_block = "{ " + " ".join(fields) + " }"
-    return f"{{ {op_name}{arg_block} {fields_block} }}"
+def build_arg_block(op, overrides=None):
+    """(arg: value, ...) for op, guessed values unless overridden per argument."""
+    overrides = overrides or {}
+    arg_parts = [f"{a}: {json.dumps(overrides.get(a, guess_value(a)))}" for a in op["args"]]
+    return f"({', '.join(arg_parts)})" if arg_parts else ""
+
+def build_operation_query(op, overrides=None):
+    return f"{{ {op['name']}{build_arg_block(op, overrides)} {op['selection']} }}"
 
 def extract_operations(schema):
-    ops = []
-    for t in schema.get("types", []):
-        if t.get("fields"):
-            for f in t["fields"]:
-                args = [a["name"] for a in f.get("args", [])]
-                type_name = get_named_type(f.get("type", {}))
-                ops.append({"name": f["name"], "args": args, "type_name": type_name})
-    return ops
+    return compile_schema(None, None, schema).operations
 
 def check_operations(url, headers, results_dir, threads, schema=None):
     checker_dir = prepare_results_folder(results_dir, "checker", url)
-    if not schema:
-        schema = get_schema(url, headers)
-    if not schema:
+    compiled = compile_schema(url, headers, schema)
+    if not compiled:
         thread_safe_print(f"[ERROR] Cannot get schema for {url}")
         return []
 
-    schema_types = schema.get("types", [])
-    operations = extract_operations(schema)
+    operations = compiled.operations
     findings = []
 
     def run_op(op):
-        query_str = build_operation_query(op["name"], op["args"], op["type_name"], schema_types)
+        query_str = build_operation_query(op)
         query_json = {"query": query_str}
         resp = post_graphql(url, query_json, headers)
         if is_success(resp):
-            thread_safe_print(f"[SUCCESS] Operation accessible: {op['name']} ({url})")
+            thread_safe_print(f"[SUCCESS] Operation accessible: {op['name']} ({url})", scan_log.QUIET)
+            scan_log.count(scan_log.HITS)
             save_result(os.path.join(checker_dir, f"{op['name']}.txt"), url, query_json, resp)
             try:
                 response_body = json.dumps(resp.json(), indent=2, ensure_ascii=False)
@@ -312,7 +337,8 @@ def check_operations(url, headers, results_dir, threads, schema=None):
 
     with ThreadPoolExecutor(max_workers=threads) as ex:
         futures = [ex.submit(run_op, op) for op in operations]
-        for fut in as_completed(futures):
+        # Submission (schema) order, so the report does not depend on timing
+        for fut in futures:
             res = fut.result()
             if res:
                 findings.append(res)
@@ -328,14 +354,12 @@ def check_idor(url, headers, results_dir, threads, schema=None, idor_ids=None):
     Compare responses — if different IDs return different data, it's likely IDOR.
     """
     idor_dir = prepare_results_folder(results_dir, "idor", url)
-    if not schema:
-        schema = get_schema(url, headers)
-    if not schema:
+    compiled = compile_schema(url, headers, schema)
+    if not compiled:
         thread_safe_print(f"[ERROR] Cannot get schema for {url}")
         return []
 
-    schema_types = schema.get("types", [])
-    operations = extract_operations(schema)
+    operations = compiled.operations
     ids_to_try = idor_ids if idor_ids else ["1", "2", "3", "4", "5",
                                             "00000000-0000-0000-0000-000000000001",
                                             "00000000-0000-0000-0000-000000000002"]
@@ -345,18 +369,7 @@ def check_idor(url, headers, results_dir, threads, schema=None, idor_ids=None):
         results_per_id = {}
         for test_id in ids_to_try:
             # Build query with this specific ID, other args get defaults
-            arg_parts = []
-            for a in op["args"]:
-                if a == id_arg:
-                    arg_parts.append(f"{a}: {json.dumps(test_id)}")
-                else:
-                    arg_parts.append(f"{a}: {json.dumps(guess_value(a))}")
-            arg_block = f"({', '.join(arg_parts)})"
-            fields_block = ""
-            if op["type_name"]:
-                fields = get_fields_recursive(op["type_name"], schema_types)
-                fields_block = "{ " + " ".join(fields) + " }"
-            query_str = f"{{ {op['name']}{arg_block} {fields_block} }}"
+            query_str = build_operation_query(op, {id_arg: test_id})
             query_json = {"query": query_str}
             resp = post_graphql(url, query_json, headers)
             if is_success(resp):
@@ -368,9 +381,11 @@ def check_idor(url, headers, results_dir, threads, schema=None, idor_ids=None):
         if len(results_per_id) > 1:
             unique_responses = {json.dumps(v, sort_keys=True) for v in results_per_id.values()}
             if len(unique_responses) > 1:
-                thread_safe_print(f"[IDOR] Different data for different IDs: {op['name']}({id_arg}) ({url})")
+                thread_safe_print(f"[IDOR] Different data for different IDs: {op['name']}({id_arg}) ({url})", scan_log.QUIET)
+                scan_log.count(scan_log.HITS)
             else:
-                thread_safe_print(f"[IDOR?] Same data for all IDs (might still be IDOR): {op['name']}({id_arg}) ({url})")
+                thread_safe_print(f"[IDOR?] Same data for all IDs (might still be IDOR): {op['name']}({id_arg}) ({url})", scan_log.QUIET)
+                scan_log.count(scan_log.HITS)
 
             fname = f"idor_{op['name']}_{id_arg}.txt"
             with open(os.path.join(idor_dir, fname), "w", encoding="utf-8") as f:
@@ -382,15 +397,12 @@ def check_idor(url, headers, results_dir, threads, schema=None, idor_ids=None):
                     "url": url, "responses": results_per_id}
         return None
 
-    tasks = []
-    for op in operations:
-        for arg in op["args"]:
-            if any(id_kw in arg.lower() for id_kw in ["id", "user", "account", "customer"]):
-                tasks.append((op, arg))
+    tasks = [(op, arg) for op in operations for arg in op["id_args"]]
 
     with ThreadPoolExecutor(max_workers=threads) as ex:
         futures = [ex.submit(run_idor, op, arg) for op, arg in tasks]
-        for fut in as_completed(futures):
+        # Submission (schema) order, so the report does not depend on timing
+        for fut in futures:
             res = fut.result()
             if res:
                 findings.append(res)
@@ -404,27 +416,24 @@ def check_batch(url, headers, results_dir, schema=None):
     Tests if batching is enabled (often bypasses rate limiting).
     """
     batch_dir = prepare_results_folder(results_dir, "batch", url)
-    if not schema:
-        schema = get_schema(url, headers)
-    if not schema:
+    compiled = compile_schema(url, headers, schema)
+    if not compiled:
         thread_safe_print(f"[ERROR] Cannot get schema for {url}")
         return []
 
-    schema_types = schema.get("types", [])
-    operations = extract_operations(schema)[:10]  # take first 10 ops for batch test
+    operations = compiled.operations[:10]  # take first 10 ops for batch test
 
-    batch_payload = []
-    for op in operations:
-        query_str = build_operation_query(op["name"], op["args"], op["type_name"], schema_types)
-        batch_payload.append({"query": query_str})
+    batch_payload = [{"query": build_operation_query(op)} for op in operations]
 
+    scan_log.count(scan_log.REQUESTS)
     try:
-        resp = requests.post(url, headers=headers, json=batch_payload, timeout=15, verify=False)
+        resp = get_transport().post(url, batch_payload, headers, 15)
         if resp.status_code == 200:
             try:
                 data = resp.json()
                 if isinstance(data, list):
-                    thread_safe_print(f"[BATCH] Batching ENABLED on {url} — {len(data)} responses received")
+                    thread_safe_print(f"[BATCH] Batching ENABLED on {url} — {len(data)} responses received", scan_log.QUIET)
+                    scan_log.count(scan_log.HITS)
                     fpath = os.path.join(batch_dir, "batch_result.txt")
                     curl_cmd = (
                         f"curl -k -X POST \"{url}\" "
@@ -442,6 +451,7 @@ def check_batch(url, headers, results_dir, schema=None):
                 pass
     except Exception as e:
         thread_safe_print(f"[ERROR] Batch request failed: {e}")
+        scan_log.count(scan_log.ERRORS)
     return []
 
 # === Aliases (Rate Limit Bypass) ===
@@ -451,14 +461,12 @@ def check_aliases(url, headers, results_dir, schema=None, alias_count=10):
     Can bypass per-request rate limits.
     """
     alias_dir = prepare_results_folder(results_dir, "aliases", url)
-    if not schema:
-        schema = get_schema(url, headers)
-    if not schema:
+    compiled = compile_schema(url, headers, schema)
+    if not compiled:
         thread_safe_print(f"[ERROR] Cannot get schema for {url}")
         return []
 
-    schema_types = schema.get("types", [])
-    operations = extract_operations(schema)
+    operations = compiled.operations
 
     # Find operations with ID-like args — most useful for alias abuse
     id_ops = [op for op in operations
@@ -468,23 +476,20 @@ def check_aliases(url, headers, results_dir, schema=None, alias_count=10):
     for op in id_ops:
         alias_parts = []
         ids = list(range(1, alias_count + 1))
+        id_args = [a for a in op["args"] if "id" in a.lower()]
+        # The selection repeats per alias, so each copy gets its share of the budget
+        selection = compiled.selection_block(op["type_name"], max(256, compiled.max_bytes // alias_count),
+                                             max(10, compiled.max_fields // alias_count))
         for i, test_id in enumerate(ids):
-            arg_parts = []
-            for a in op["args"]:
-                val = str(test_id) if "id" in a.lower() else guess_value(a)
-                arg_parts.append(f"{a}: {json.dumps(val)}")
-            arg_block = f"({', '.join(arg_parts)})"
-            fields_block = ""
-            if op["type_name"]:
-                fields = get_fields_recursive(op["type_name"], schema_types)
-                fields_block = "{ " + " ".join(fields) + " }"
-            alias_parts.append(f"r{i}: {op['name']}{arg_block} {fields_block}")
+            arg_block = build_arg_block(op, dict.fromkeys(id_args, str(test_id)))
+            alias_parts.append(f"r{i}: {op['name']}{arg_block} {selection}")
 
         query_str = "{ " + " ".join(alias_parts) + " }"
         query_json = {"query": query_str}
         resp = post_graphql(url, query_json, headers)
         if is_success(resp):
-            thread_safe_print(f"[ALIASES] Rate limit bypass works for {op['name']} ({alias_count} aliases) on {url}")
+            thread_safe_print(f"[ALIASES] Rate limit bypass works for {op['name']} ({alias_count} aliases) on {url}", scan_log.QUIET)
+            scan_log.count(scan_log.HITS)
             fpath = os.path.join(alias_dir, f"aliases_{op['name']}.txt")
             save_result(fpath, url, query_json, resp)
             try:
@@ -567,18 +572,91 @@ def generate_report(url, pii_findings, op_findings, idor_findings, batch_finding
     report_path = os.path.join(output_dir, "report.md")
     with open(report_path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
-    thread_safe_print(f"\n[REPORT] Saved to {report_path}")
+    thread_safe_print(f"\n[REPORT] Saved to {report_path}", scan_log.QUIET)
     return report_path
 
+# === Target scheduling ===
+# Check modes in report order (-m accepts these plus "all")
+MODES = ["pii", "checker", "idor", "batch", "aliases"]
+
+def scan_target(url, args, headers):
+    """Run the selected modes against one target and write its report; None if skipped."""
+    thread_safe_print(f"\n{'='*60}")
+    thread_safe_print(f"[TARGET] {url}")
+    thread_safe_print(f"{'='*60}")
+
+    # Fetch and compile the schema once, reuse across modes
+    schema = compile_schema(url, headers)
+    if not schema:
+        thread_safe_print(f"[WARN] Introspection disabled or unreachable — skipping {url}")
+        return None
+
+    # The modes only read the compiled schema, so they run side by side and share
+    # the target's request budget (-t) in the transport; a target takes about as
+    # long as its slowest mode rather than the sum of all of them
+    stages = {
+        "pii": ("PII Check", lambda: check_pii(url, headers, args.output, args.threads, schema=schema)),
+        "checker": ("Operations Check",
+                    lambda: check_operations(url, headers, args.output, args.threads, schema=schema)),
+        "idor": ("IDOR Check", lambda: check_idor(url, headers, args.output, args.threads,
+                                                  schema=schema, idor_ids=args.idor_ids)),
+        "batch": ("Batch Check", lambda: check_batch(url, headers, args.output, schema=schema)),
+        "aliases": ("Aliases Check", lambda: check_aliases(url, headers, args.output,
+                                                           schema=schema, alias_count=args.alias_count)),
+    }
+    selected = [mode for mode in MODES if args.mode in (mode, "all")]
+    findings = dict.fromkeys(MODES, [])
+    with ThreadPoolExecutor(max_workers=len(selected)) as ex:
+        futures = {}
+        for mode in selected:
+            title, stage = stages[mode]
+            thread_safe_print(f"\n[*] {title} ({url})")
+            futures[mode] = ex.submit(stage)
+        for mode, fut in futures.items():
+            try:
+                findings[mode] = fut.result()
+            except Exception as e:
+                # One failed mode must not drop the findings of the others
+                thread_safe_print(f"[ERROR] {stages[mode][0]} failed on {url}: {e}", scan_log.QUIET)
+                scan_log.count(scan_log.ERRORS)
+
+    # Report per URL — sits in the root of the target folder
+    url_output = os.path.join(args.output, sanitize_url(url))
+    os.makedirs(url_output, exist_ok=True)
+    return generate_report(url, *(findings[mode] for mode in MODES), url_output)
+
+def scan_targets(urls, args, headers):
+    """Scan up to --parallel-targets targets at once; a slow host no longer stalls the rest."""
+    if args.parallel_targets <= 1 or len(urls) <= 1:
+        return [scan_target(url, args, headers) for url in urls]
+    reports = []
+    with ThreadPoolExecutor(max_workers=args.parallel_targets) as ex:
+        futures = {ex.submit(scan_target, url, args, headers): url for url in urls}
+        for fut in as_completed(futures):
+            try:
+                reports.append(fut.result())
+            except Exception as e:
+                thread_safe_print(f"[ERROR] Scan of {futures[fut]} failed: {e}", scan_log.QUIET)
+                scan_log.count(scan_log.ERRORS)
+    return reports
+
 # === Main ===
 def main():
     parser = argparse.ArgumentParser(description="GraphQL Security Analyzer")
-    parser.add_argument("-m", "--mode", choices=["pii", "checker", "idor", "batch", "aliases", "all"],
+    parser.add_argument("-m", "--mode", choices=MODES + ["all"],
                         default="all")
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("-d", "--domain", help="Single GraphQL endpoint URL")
     group.add_argument("-f", "--file", help="File with list of endpoints")
-    parser.add_argument("-t", "--threads", type=int, default=5)
+    parser.add_argument("-t", "--threads", type=int, default=5,
+                        help="Concurrent requests per target (default: 5)")
+    parser.add_argument("-T", "--parallel-targets", type=int, default=4,
+                        help="Targets scanned at the same time (default: 4)")
+    parser.add_argument("--max-in-flight", type=int, default=0,
+                        help="Global cap on concurrent requests across all targets "
+                             "(default: threads x parallel targets)")
+    parser.add_argument("--http2", action="store_true",
+                        help="Use HTTP/2 where the server supports it (needs httpx[http2])")
     parser.add_argument("-o", "--output", default="graphql_results")
 
     # Auth options
@@ -593,8 +671,18 @@ def main():
                         help="Custom IDs to try for IDOR (default: 1-5 + UUIDs)")
     parser.add_argument("--alias-count", type=int, default=10,
                         help="Number of aliases to use in alias check (default: 10)")
+    parser.add_argument("--max-query-bytes", type=int, default=graphql_schema.DEFAULT_MAX_BYTES,
+                        help=f"Byte budget for a generated selection set; PII and scalar fields are kept first "
+                             f"(default: {graphql_schema.DEFAULT_MAX_BYTES})")
+    parser.add_argument("--max-query-fields", type=int, default=graphql_schema.DEFAULT_MAX_FIELDS,
+                        help=f"Field budget for a generated selection set (default: {graphql_schema.DEFAULT_MAX_FIELDS})")
+    scan_log.add_arguments(parser)
 
     args = parser.parse_args()
+    scan_log.configure_from_args(args)
+    configure_query_budget(args.max_query_bytes, args.max_query_fields)
+    configure_concurrency(args.max_in_flight or args.threads * max(1, args.parallel_targets), args.threads,
+                          http2=args.http2)
 
     if os.path.exists(args.output):
         import shutil
@@ -604,50 +692,18 @@ def main():
     headers = build_headers(args)
 
     urls = [args.domain] if args.domain else open(args.file).read().splitlines()
-    urls = [u.strip() for u in urls if u.strip()]
-
-    for url in urls:
-        thread_safe_print(f"\n{'='*60}")
-        thread_safe_print(f"[TARGET] {url}")
-        thread_safe_print(f"{'='*60}")
-
-        # Fetch schema once, reuse across modes
-        schema = get_schema(url, headers)
-        if not schema:
-            thread_safe_print(f"[WARN] Introspection disabled or unreachable — skipping {url}")
-            continue
-
-        pii_findings = op_findings = idor_findings = batch_findings = alias_findings = []
-
-        if args.mode in ["pii", "all"]:
-            thread_safe_print(f"\n[*] PII Check")
-            pii_findings = check_pii(url, headers, args.output, args.threads)
+    urls = list(dict.fromkeys(u.strip() for u in urls if u.strip()))
 
-        if args.mode in ["checker", "all"]:
-            thread_safe_print(f"\n[*] Operations Check")
-            op_findings = check_operations(url, headers, args.output, args.threads, schema=schema)
-
-        if args.mode in ["idor", "all"]:
-            thread_safe_print(f"\n[*] IDOR Check")
-            idor_findings = check_idor(url, headers, args.output, args.threads,
-                                       schema=schema, idor_ids=args.idor_ids)
-
-        if args.mode in ["batch", "all"]:
-            thread_safe_print(f"\n[*] Batch Check")
-            batch_findings = check_batch(url, headers, args.output, schema=schema)
-
-        if args.mode in ["aliases", "all"]:
-            thread_safe_print(f"\n[*] Aliases Check")
-            alias_findings = check_aliases(url, headers, args.output,
-                                           schema=schema, alias_count=args.alias_count)
-
-        # Report per URL — sits in the root of the target folder
-        url_output = os.path.join(args.output, sanitize_url(url))
-        os.makedirs(url_output, exist_ok=True)
-        generate_report(url, pii_findings, op_findings, idor_findings,
-                        batch_findings, alias_findings, url_output)
-
-    thread_safe_print(f"\n[DONE] Results saved to {args.output}/")
+    try:
+        scan_targets(urls, args, headers)
+    finally:
+        close_transport()
+
+    stats = http_pool.stats()
+    if stats["requests"]:
+        thread_safe_print(f"[STATS] {stats['requests']} requests, {stats['new_connections']} new connections, "
+                          f"{stats['reused']} reused ({stats['reuse_ratio']:.0%})")
+    thread_safe_print(f"\n[DONE] Results saved to {args.output}/", scan_log.QUIET)
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,13 @@
 import requests
 import json
 import argparse
-import threading
 import os
 import shutil
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import urllib3
+
+import scan_log
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 HEADERS = {
@@ -13,11 +15,8 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
-print_lock = threading.Lock()
-
-def thread_safe_print(message):
-    with print_lock:
-        print(message)
+# Вывод идёт через общую очередь scan_log (без блокировки в рабочих потоках)
+thread_safe_print = scan_log.log
 
 # === Очистка и подготовка папки результатов ===
 def prepare_results_folder(results_dir, mode, url):
@@ -71,11 +70,13 @@ INTROSPECTION_QUERY = {
 
 def post_graphql(url, query):
     try:
+        scan_log.count(scan_log.REQUESTS)
         resp = requests.post(url, headers=HEADERS, json=query, timeout=10, verify=False)
         if resp.status_code == 200:
             return resp.json()
     except Exception as e:
         thread_safe_print(f"[ERROR] {e}")
+        scan_log.count(scan_log.ERRORS)
     return None
 
 def get_type(schema_types, type_name):
@@ -140,12 +141,14 @@ def generate_poc(field_info, schema_types):
 def execute_poc_pii(url, query, field_info, results_dir):
     try:
         query_json = {"query": query}
+        scan_log.count(scan_log.REQUESTS)
         resp = requests.post(url, headers=HEADERS, json=query_json, timeout=10, verify=False)
         if resp.status_code == 200:
             ctype = resp.headers.get("content-type", "").lower()
             if "application/json" in ctype or "text/plain" in ctype:
                 if resp.text.strip() and "errors" not in resp.text:
-                    thread_safe_print(f"[SUCCESS] {url} :: {field_info['field']}")
+                    thread_safe_print(f"[SUCCESS] {url} :: {field_info['field']}", scan_log.QUIET)
+                    scan_log.count(scan_log.HITS)
                     filename = f"{field_info['type']}_{field_info['field']}.txt"
                     filepath = os.path.join(results_dir, filename)
                     curl_cmd = (
@@ -163,6 +166,7 @@ def execute_poc_pii(url, query, field_info, results_dir):
                     return field_info['field']
     except Exception as e:
         thread_safe_print(f"[ERROR] executing {query}: {e}")
+        scan_log.count(scan_log.ERRORS)
     return None
 
 def check_pii(url, results_dir, threads):
@@ -233,6 +237,7 @@ def check_introspection(url):
         """
     }
     try:
+        scan_log.count(scan_log.REQUESTS)
         r = requests.post(url, headers=HEADERS, json=introspection_query, timeout=10, verify=False)
         if r.status_code == 200 and "application/json" in r.headers.get("content-type", "").lower():
             data = r.json()
@@ -303,12 +308,14 @@ def check_single_operation(url, operation, schema_types, results_dir):
 
     query = {"query": f"{{ {op_name}{arg_block} {fields_block} }}"}
     try:
+        scan_log.count(scan_log.REQUESTS)
         r = requests.post(url, headers=HEADERS, json=query, timeout=10, verify=False)
         if r.status_code == 200:
             ctype = r.headers.get("content-type", "").lower()
             if "application/json" in ctype or "text/plain" in ctype:
                 if r.text.strip() and "errors" not in r.text:
-                    thread_safe_print(f"[SUCCESS] {url} :: {op_name}{arg_block}")
+                    thread_safe_print(f"[SUCCESS] {url} :: {op_name}{arg_block}", scan_log.QUIET)
+                    scan_log.count(scan_log.HITS)
                     filename = f"{op_name}.txt"
                     filepath = os.path.join(results_dir, filename)
                     curl_cmd = (
@@ -355,7 +362,9 @@ def main():
     group.add_argument("-f", "--file", help="Файл со списком GraphQL endpoints (по одному в строке)")
     parser.add_argument("-t", "--threads", type=int, default=5, help="Количество потоков")
     parser.add_argument("-o", "--output", default="graphql_results", help="Папка для сохранения результатов")
+    scan_log.add_arguments(parser)
     args = parser.parse_args()
+    scan_log.configure_from_args(args)
 
     # Создаем главную папку результатов
     os.makedirs(args.output, exist_ok=True)
@@ -377,7 +386,7 @@ def main():
             thread_safe_print(f"[INFO] Проверка операций GraphQL для {url}")
             check_operations(url, results_dir, args.threads)
 
-    thread_safe_print(f"\n[DONE] Все PoC сохранены в {results_dir}/ (подпапки: pii/<url>/, checker/<url>/)")
+    thread_safe_print(f"\n[DONE] Все PoC сохранены в {results_dir}/ (подпапки: pii/<url>/, checker/<url>/)", scan_log.QUIET)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""
+graphql_schema.py — compiled view of a GraphQL introspection schema.
+
+Built once per target and shared by every check mode:
+  * name -> type dict (introspection returns a flat list of types);
+  * memoized selection set per type, so the same nested query body is not
+    rebuilt for every operation, ID and alias. Selections are built best-first
+    within a byte and field budget: scalar leaves ranked by leaf_score (PII
+    first) win over deep or low-value branches;
+  * the operation list with argument names, return type and selection
+    precomputed.
+
+    compiled = CompiledSchema(get_schema(url, headers), max_bytes=8192, leaf_score=score)
+    compiled.selection("User")     # "id name posts { id title }"
+    for op in compiled.operations:
+        op["name"], op["args"], op["type_name"], op["selection"]
+"""
+
+import heapq
+import itertools
+
+MAX_DEPTH = 3
+ID_ARG_KEYWORDS = ("id", "user", "account", "customer")
+
+# Selection budget per query body: wide schemas otherwise expand into
+# hundreds of kilobytes that servers reject or take seconds to execute
+DEFAULT_MAX_BYTES = 8 * 1024
+DEFAULT_MAX_FIELDS = 250
+# Each nesting level costs this much score, so a deep leaf has to be more
+# interesting (PII) than a shallow one to win the budget
+DEPTH_PENALTY = 1.0
+
+
+def get_named_type(type_obj):
+    t = type_obj
+    while t and t.get("ofType"):
+        t = t["ofType"]
+    return t.get("name") if t else None
+
+
+class _Node:
+    """Field in a selection being built; children is filled only for object fields"""
+    __slots__ = ("name", "index", "parent", "type_name", "depth", "children", "added")
+
+    def __init__(self, name, index, parent, type_name, depth):
+        self.name = name
+        self.index = index          # position in the parent type, for stable output order
+        self.parent = parent
+        self.type_name = type_name  # None for scalar/enum leaves
+        self.depth = depth
+        self.children = []
+        self.added = False
+
+    def on_path(self, type_name):
+        node = self
+        while node is not None:
+            if node.type_name == type_name:
+                return True
+            node = node.parent
+        return False
+
+    def pending_cost(self):
+        """(bytes, fields, nodes) to add this field together with ancestors not yet selected"""
+        cost_bytes, cost_fields, pending = 0, 0, []
+        node = self
+        while not node.added:
+            pending.append(node)
+            # leaf: "name "; object: "name { ... } "
+            cost_bytes += len(node.name) + (1 if node.type_name is None else 6)
+            cost_fields += 1
+            node = node.parent
+        return cost_bytes, cost_fields, pending
+
+
+def _default_leaf_score(name):
+    return 1.0
+
+
+class CompiledSchema:
+    def __init__(self, schema, max_bytes=DEFAULT_MAX_BYTES, max_fields=DEFAULT_MAX_FIELDS,
+                 leaf_score=None):
+        self.raw = schema
+        self.types = {t["name"]: t for t in schema.get("types") or [] if t.get("name")}
+        # Only types with fields can take a selection set
+        self.object_types = {name: t for name, t in self.types.items() if t.get("fields")}
+        self.query_type = (schema.get("queryType") or {}).get("name")
+        self.mutation_type = (schema.get("mutationType") or {}).get("name")
+        self.max_bytes = max_bytes
+        self.max_fields = max_fields
+        self.leaf_score = leaf_score or _default_leaf_score
+        # Per type: (index, field name, nested object type or None, leaf score) for every field
+        scores = {}
+        members = {}
+        for name, t in self.object_types.items():
+            members[name] = []
+            for index, f in enumerate(t["fields"]):
+                nested = get_named_type(f["type"])
+                if nested in self.object_types:
+                    members[name].append((index, f["name"], nested, None))
+                else:
+                    if f["name"] not in scores:
+                        scores[f["name"]] = self.leaf_score(f["name"])
+                    members[name].append((index, f["name"], None, scores[f["name"]]))
+        # An object field is worth what its best direct leaf is worth, one level deeper
+        type_scores = {name: max((m[3] for m in fields if m[2] is None), default=0.0)
+                       for name, fields in members.items()}
+        # ... and each type's fields are kept best first: (score, index, name, nested)
+        self._members = {
+            name: sorted(((score if nested is None else type_scores[nested] - DEPTH_PENALTY,
+                           index, field, nested) for index, field, nested, score in fields),
+                         key=lambda m: (-m[0], m[1]))
+            for name, fields in members.items()
+        }
+        self._selections = {}
+        self.operations = self._compile_operations()
+
+    def has_fields(self, type_name):
+        return type_name in self.object_types
+
+    def selection(self, type_name, max_bytes=None, max_fields=None):
+        """Memoized selection set body for type_name (without braces) within the budget"""
+        key = (type_name, max_bytes or self.max_bytes, max_fields or self.max_fields)
+        selection = self._selections.get(key)
+        if selection is None:
+            # Racing threads may build it twice; the result is identical
+            selection = self._selections[key] = self._build_selection(*key)
+        return selection
+
+    def selection_block(self, type_name, max_bytes=None, max_fields=None):
+        """{ selection } for object types, "" for scalars and enums"""
+        if not self.has_fields(type_name):
+            return ""
+        return "{ " + self.selection(type_name, max_bytes, max_fields) + " }"
+
+    def _push_next(self, heap, order, parent, position):
+        """Queue the best remaining field of parent from position on (skipping cycles and depth)"""
+        members = self._members[parent.type_name]
+        while position < len(members):
+            score, _, _, nested = members[position]
+            if nested is None or (parent.depth < MAX_DEPTH and not parent.on_path(nested)):
+                # Highest score first; ties keep schema order
+                heapq.heappush(heap, (DEPTH_PENALTY * parent.depth - score, next(order), parent, position))
+                return
+            position += 1
+
+    def _build_selection(self, type_name, max_bytes, max_fields):
+        """Best-first selection within the budget
+        
+        Every selected object keeps a cursor over its fields sorted by score, and the
+        heap holds one candidate per cursor, so leaves are taken globally by score
+        (PII, then shallow scalars) and a branch is opened only when its best leaf is
+        next. Cycles are cut by walking the parent chain, without copying visited sets.
+        """
+        if not self.has_fields(type_name):
+            return "__typename"
+        root = _Node(type_name, 0, None, type_name, 0)
+        root.added = True
+        heap, order = [], itertools.count()
+        self._push_next(heap, order, root, 0)
+        used_bytes = used_fields = pops = 0
+        max_pops = max_fields * 8
+        while heap and used_fields < max_fields and max_bytes - used_bytes > 1 and pops < max_pops:
+            pops += 1
+            parent, position = heapq.heappop(heap)[2:]
+            self._push_next(heap, order, parent, position + 1)
+            _, index, name, nested = self._members[parent.type_name][position]
+            if nested is not None:
+                node = _Node(name, index, parent, nested, parent.depth + 1)
+                self._push_next(heap, order, node, 0)
+                continue
+            node = _Node(name, index, parent, None, parent.depth)
+            cost_bytes, cost_fields, pending = node.pending_cost()
+            if used_bytes + cost_bytes > max_bytes or used_fields + cost_fields > max_fields:
+                continue
+            used_bytes += cost_bytes
+            used_fields += cost_fields
+            for added in reversed(pending):
+                added.added = True
+                added.parent.children.append(added)
+        return self._render(root) or "__typename"
+
+    def _render(self, node):
+        parts = []
+        for child in sorted(node.children, key=lambda c: c.index):
+            if child.type_name is None:
+                parts.append(child.name)
+            else:
+                parts.append(f"{child.name} {{ {self._render(child)} }}")
+        return " ".join(parts)
+
+    def _compile_operations(self):
+        ops = []
+        for t in self.object_types.values():
+            for f in t["fields"]:
+                args = [a["name"] for a in f.get("args") or []]
+                type_name = get_named_type(f.get("type", {}))
+                ops.append({
+                    "name": f["name"],
+                    "args": args,
+                    "type_name": type_name,
+                    "selection": self.selection_block(type_name),
+                    "id_args": [a for a in args if any(kw in a.lower() for kw in ID_ARG_KEYWORDS)],
+                })
+        return ops
@@ -0,0 +1,190 @@
+"""
+graphql_transport.py — pooled GraphQL transport for graphql_analyzer.
+
+requests.post without a Session opens a new (TLS) connection for every
+query. Here every query goes through one long-lived client on a background
+asyncio loop:
+  * aiohttp with keep-alive connection pooling (default), or
+  * httpx with HTTP/2 (http2=True, needs `pip install httpx[http2]`);
+  * per-target and global semaphores cap concurrent requests.
+
+The check modes keep their thread pools and call the blocking facade:
+
+    transport = create(per_target=5, global_limit=20)
+    resp = transport.post(url, {"query": "{ __typename }"}, headers, timeout=10)
+    resp.status_code, resp.headers.get("content-type"), resp.json(), resp.text
+    transport.close()
+
+Without aiohttp, create() falls back to SessionTransport: the same interface
+over http_pool's keep-alive requests sessions.
+"""
+
+import asyncio
+import json
+import threading
+from contextlib import contextmanager, nullcontext
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+from requests.structures import CaseInsensitiveDict
+
+import http_pool
+
+try:
+    import aiohttp
+except ImportError:  # falls back to SessionTransport
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 is optional
+    httpx = None
+
+try:
+    import h2  # noqa: F401 — httpx.AsyncClient(http2=True) fails without it
+except ImportError:
+    h2 = None
+
+HTTP2_AVAILABLE = httpx is not None and h2 is not None
+
+DEFAULT_POOL_SIZE = 100
+
+
+class Response:
+    """The parts of requests.Response the analyzer uses"""
+
+    def __init__(self, status_code, headers, content, encoding=None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _no_cookies():
+    # Like bare requests.post: cookies set by one response are not sent with the next
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+class AsyncTransport:
+    """aiohttp (or httpx for HTTP/2) client on a background event loop"""
+
+    def __init__(self, per_target=None, global_limit=None, http2=False, pool_size=DEFAULT_POOL_SIZE):
+        if http2 and not HTTP2_AVAILABLE:
+            raise ImportError("HTTP/2 needs httpx and h2: pip install httpx[http2]")
+        if not http2 and aiohttp is None:
+            raise ImportError("AsyncTransport needs aiohttp: pip install aiohttp")
+        self.http2 = http2
+        self.per_target = per_target
+        self.global_limit = global_limit
+        self.pool_size = max(pool_size, global_limit or 0)
+        self._targets = {}   # url -> asyncio.Semaphore, touched only on the loop thread
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="graphql-transport", daemon=True)
+        self._thread.start()
+        try:
+            self._run(self._open())
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _open(self):
+        self._global = asyncio.Semaphore(self.global_limit) if self.global_limit else None
+        if self.http2:
+            limits = httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            self._client = httpx.AsyncClient(http2=True, verify=False, limits=limits,
+                                             cookies=httpx.Cookies(_no_cookies()))
+        else:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.per_target or 0,
+                                             ssl=False)
+            self._client = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar(),
+                                                 trace_configs=[http_pool.aiohttp_trace_config()])
+
+    def _target_slot(self, url):
+        if not self.per_target:
+            return nullcontext()
+        slot = self._targets.get(url)
+        if slot is None:
+            slot = self._targets[url] = asyncio.Semaphore(self.per_target)
+        return slot
+
+    async def post_async(self, url, payload, headers, timeout=10):
+        """POST payload as JSON; must run on this transport's loop"""
+        # Per-target first: a target at its cap must not sit on a global slot while waiting
+        async with self._target_slot(url):
+            async with self._global or nullcontext():
+                try:
+                    if self.http2:
+                        resp = await self._client.post(url, json=payload, headers=headers, timeout=timeout)
+                        return Response(resp.status_code, resp.headers, resp.content, resp.encoding)
+                    async with self._client.post(url, json=payload, headers=headers,
+                                                 timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                        content = await resp.read()
+                        return Response(resp.status, resp.headers, content, resp.charset)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"Read timed out after {timeout}s: {url}") from None
+
+    def post(self, url, payload, headers, timeout=10):
+        """Blocking facade for worker threads"""
+        return self._run(self.post_async(url, payload, headers, timeout))
+
+    def close(self):
+        if not self._loop.is_running():
+            return
+        client_close = self._client.aclose() if self.http2 else self._client.close()
+        self._run(client_close)
+        self._stop_loop()
+
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class SessionTransport:
+    """Blocking fallback over http_pool's keep-alive requests sessions, same limits"""
+
+    def __init__(self, per_target=None, global_limit=None, pool_size=DEFAULT_POOL_SIZE):
+        self.per_target = per_target
+        self._pool = http_pool.SessionPool(per_host=per_target or http_pool.DEFAULT_PER_HOST,
+                                           max_hosts=pool_size)
+        self._global = threading.BoundedSemaphore(global_limit) if global_limit else None
+        self._targets = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _slot(self, url):
+        target = None
+        if self.per_target:
+            with self._lock:
+                target = self._targets.setdefault(url, threading.BoundedSemaphore(self.per_target))
+        with target or nullcontext():
+            with self._global or nullcontext():
+                yield
+
+    def post(self, url, payload, headers, timeout=10):
+        with self._slot(url):
+            return self._pool.post(url, json=payload, headers=headers, timeout=timeout, verify=False)
+
+    def close(self):
+        self._pool.close()
+
+
+def create(per_target=None, global_limit=None, http2=False):
+    """AsyncTransport when aiohttp (or httpx with h2 for HTTP/2) is installed, SessionTransport otherwise
+
+    Without httpx[http2] an HTTP/2 request falls back to HTTP/1.1 (check HTTP2_AVAILABLE to warn).
+    """
+    if http2 and HTTP2_AVAILABLE:
+        return AsyncTransport(per_target, global_limit, http2=True)
+    if aiohttp is not None:
+        return AsyncTransport(per_target, global_limit)
+    return SessionTransport(per_target, global_limit)
@@ -0,0 +1,196 @@
+"""
+host_limiter.py — ограничение нагрузки на каждый хост при проверке эндпоинтов.
+
+HostLimiter: на каждый хост — token bucket (запросов в секунду) и AIMD-окно
+параллельных запросов. Ответы 429/503 и таймауты вдвое сужают окно
+(не чаще раза в секунду, Retry-After ставит хост на паузу), чистые ответы
+расширяют его примерно на 1 за каждое окно успешных запросов.
+
+HostScheduler: очередь эндпоинтов с разбивкой по хостам; get() обходит хосты
+по кругу и отдаёт эндпоинт хоста, у которого есть свободное окно, поэтому
+один большой спек не занимает все потоки проверки.
+
+    limiter = HostLimiter(rate=20, initial=4, maximum=32)
+    limiter.acquire(host)
+    try:
+        response = ...
+    finally:
+        limiter.release(host, status=response.status_code)
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+
+DEFAULT_RATE = 20.0          # запросов в секунду на хост
+DEFAULT_CONCURRENCY = 4      # стартовое окно параллельных запросов на хост
+DEFAULT_MAX_CONCURRENCY = 32
+
+BACKOFF_STATUSES = (429, 503)
+MAX_RETRY_AFTER = 60.0
+
+
+class _HostState:
+    __slots__ = ("tokens", "refilled_at", "window", "inflight", "paused_until", "decreased_at")
+
+    def __init__(self, rate, window):
+        self.tokens = max(rate, 1.0)
+        self.refilled_at = time.monotonic()
+        self.window = float(window)
+        self.inflight = 0
+        self.paused_until = 0.0
+        self.decreased_at = 0.0
+
+
+class HostLimiter:
+    """Token bucket + AIMD-окно параллельности на каждый хост (потокобезопасно)"""
+
+    def __init__(self, rate=DEFAULT_RATE, initial=DEFAULT_CONCURRENCY,
+                 maximum=DEFAULT_MAX_CONCURRENCY, minimum=1):
+        self.rate = rate
+        self.burst = max(rate, 1.0)
+        self.initial = initial
+        self.maximum = maximum
+        self.minimum = minimum
+        self.backoffs = 0
+        self._hosts = {}
+        self._cond = threading.Condition()
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.rate, self.initial)
+        return state
+
+    def _try_acquire(self, host):
+        """Занимает слот, если можно; иначе возвращает, сколько секунд подождать"""
+        now = time.monotonic()
+        state = self._state(host)
+        if now < state.paused_until:
+            return state.paused_until - now
+        if state.inflight >= int(state.window):
+            return 0.05  # ждём release()
+        if self.rate > 0:
+            state.tokens = min(self.burst, state.tokens + (now - state.refilled_at) * self.rate)
+            state.refilled_at = now
+            if state.tokens < 1.0:
+                return (1.0 - state.tokens) / self.rate
+            state.tokens -= 1.0
+        state.inflight += 1
+        return 0.0
+
+    def acquire(self, host):
+        with self._cond:
+            while True:
+                wait = self._try_acquire(host)
+                if wait <= 0:
+                    return
+                self._cond.wait(wait)
+
+    async def acquire_async(self, host):
+        while True:
+            with self._cond:
+                wait = self._try_acquire(host)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, host, status=None, timed_out=False, retry_after=None):
+        """Освобождает слот и подстраивает окно хоста по исходу запроса"""
+        with self._cond:
+            state = self._state(host)
+            state.inflight = max(state.inflight - 1, 0)
+            now = time.monotonic()
+            if timed_out or status in BACKOFF_STATUSES:
+                if now - state.decreased_at >= 1.0:
+                    state.window = max(self.minimum, state.window / 2)
+                    state.decreased_at = now
+                    self.backoffs += 1
+                if retry_after:
+                    state.paused_until = max(state.paused_until, now + min(retry_after, MAX_RETRY_AFTER))
+            elif status is not None:
+                state.window = min(self.maximum, state.window + 1.0 / state.window)
+            self._cond.notify_all()
+
+    def has_capacity(self, host):
+        with self._cond:
+            state = self._hosts.get(host)
+            if state is None:
+                return True
+            return state.inflight < int(state.window) and time.monotonic() >= state.paused_until
+
+    def stats(self):
+        with self._cond:
+            windows = [state.window for state in self._hosts.values()]
+        return {
+            "hosts": len(windows),
+            "backoffs": self.backoffs,
+            "min_window": min(windows) if windows else 0,
+            "max_window": max(windows) if windows else 0,
+        }
+
+
+def parse_retry_after(value):
+    """Retry-After в секундах (форму с HTTP-датой игнорируем)"""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class HostScheduler:
+    """Ограниченная очередь с разбивкой по хостам и круговым обходом хостов
+
+    put() блокируется при maxsize элементов; get() возвращает None, когда
+    очередь закрыта через close() и опустела.
+    """
+
+    def __init__(self, host_of, limiter=None, maxsize=1000):
+        self.host_of = host_of
+        self.limiter = limiter
+        self.maxsize = maxsize
+        self._queues = OrderedDict()   # host -> deque; порядок = очередь обхода
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        host = self.host_of(item)
+        with self._cond:
+            while self._size >= self.maxsize:
+                self._cond.wait()
+            self._queues.setdefault(host, deque()).append(item)
+            self._size += 1
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _pop_ready(self):
+        for host in self._queues:
+            if self.limiter is None or self.limiter.has_capacity(host):
+                return self._pop(host)
+        return None
+
+    def _pop(self, host):
+        items = self._queues.pop(host)
+        item = items.popleft()
+        if items:
+            self._queues[host] = items  # хост уходит в конец круга
+        self._size -= 1
+        self._cond.notify_all()
+        return item
+
+    def get(self):
+        with self._cond:
+            while True:
+                if self._size:
+                    item = self._pop_ready()
+                    if item is not None:
+                        return item
+                elif self._closed:
+                    return None
+                self._cond.wait(0.05)
@@ -0,0 +1,261 @@
+"""
+http_pool.py — общий пул keep-alive соединений для swagger checker.
+
+Все потоки используют один HTTPAdapter (а значит один urllib3 PoolManager),
+поэтому соединения к одному хосту переиспользуются между запросами и
+потоками. Сессии requests — потоко-локальные: сам Session не гарантирует
+потокобезопасность, а PoolManager — гарантирует.
+
+    import http_pool
+    http_pool.configure(per_host=20, max_hosts=200)
+    response = http_pool.get(url, headers=HEADERS, verify=False, timeout=10)
+    print(http_pool.stats())
+    print(http_pool.last_timings())   # dns/connect последнего запроса этого потока
+
+Тайминги DNS и установки соединения (TCP + TLS) снимаются в подклассах
+соединений urllib3; если соединение переиспользовано, их нет (None). Подклассы
+опираются на внутренности urllib3 2.x — на urllib3 1.26 тайминги не снимаются.
+"""
+
+import socket
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:  # urllib3 < 2: соединения без замеров dns/connect
+    NameResolutionError = None
+
+DEFAULT_PER_HOST = 10     # соединений на один хост (host:port)
+DEFAULT_MAX_HOSTS = 100   # сколько пулов хостов держим открытыми одновременно
+
+
+class PoolStats:
+    """Счётчики запросов и открытых соединений (для оценки переиспользования)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self):
+        with self._lock:
+            requests_count, new_connections = self.requests, self.new_connections
+        reused = max(requests_count - new_connections, 0)
+        return {
+            "requests": requests_count,
+            "new_connections": new_connections,
+            "reused": reused,
+            "reuse_ratio": reused / requests_count if requests_count else 0.0,
+        }
+
+
+_stats = PoolStats()
+
+
+# Тайминги текущего запроса потока: dns, connect (секунды) — заполняют TimedConnection
+_timings = threading.local()
+
+
+def last_timings():
+    """{"dns": ..., "connect": ...} последнего запроса в этом потоке (None — соединение переиспользовано)"""
+    return {"dns": getattr(_timings, "dns", None), "connect": getattr(_timings, "connect", None)}
+
+
+class _TimedConnectionMixin:
+    """Разделяет резолвинг и установку соединения, чтобы замерить их по отдельности"""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        _timings.dns = time.perf_counter() - started
+        # Подключаемся к уже найденным адресам; self.host (SNI, проверка сертификата)
+        # не меняется — _dns_host подменяется только на время подключения
+        dns_host = self._dns_host
+        error = None
+        try:
+            for address in list(dict.fromkeys(info[4][0] for info in addresses)):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError as e:
+                    error = e
+        finally:
+            self._dns_host = dns_host
+        raise error
+
+    def connect(self):
+        started = time.perf_counter()
+        _timings.dns = None
+        super().connect()
+        _timings.connect = time.perf_counter() - started - (_timings.dns or 0.0)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection if NameResolutionError else HTTPConnection
+
+    def _new_conn(self):
+        _stats.record_connection()
+        return super()._new_conn()
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection if NameResolutionError else HTTPSConnection
+
+    def _new_conn(self):
+        _stats.record_connection()
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter, считающий новые соединения в пулах urllib3"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+
+class SessionPool:
+    """Потоко-локальные requests.Session поверх одного общего HTTPAdapter"""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, max_hosts=DEFAULT_MAX_HOSTS):
+        self.per_host = per_host
+        self.max_hosts = max_hosts
+        # pool_block=True: поток ждёт свободное соединение, а не открывает лишнее,
+        # так что per_host — реальный лимит параллельных соединений на хост
+        self.adapter = PooledHTTPAdapter(pool_connections=max_hosts, pool_maxsize=per_host,
+                                         pool_block=True)
+        self._local = threading.local()
+
+    def session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            # Как и у голого requests.get — cookies между запросами не переносим
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            self._local.session = session
+        return session
+
+    def get(self, url, **kwargs):
+        _stats.record_request()
+        _timings.dns = _timings.connect = None
+        return self.session().get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        _stats.record_request()
+        _timings.dns = _timings.connect = None
+        return self.session().post(url, **kwargs)
+
+    def close(self):
+        self.adapter.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure(per_host=DEFAULT_PER_HOST, max_hosts=DEFAULT_MAX_HOSTS):
+    """Создаёт (или пересоздаёт) общий пул с заданными лимитами"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = SessionPool(per_host=per_host, max_hosts=max_hosts)
+    return _pool
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SessionPool()
+    return _pool
+
+
+def get(url, **kwargs):
+    """Аналог requests.get через общий пул соединений"""
+    return get_pool().get(url, **kwargs)
+
+
+def aiohttp_trace_config():
+    """TraceConfig для aiohttp, пишущий в те же счётчики, что и пул requests
+
+    Если запрос сделан с trace_request_ctx=dict, в словарь пишутся тайминги
+    dns и connect (секунды), как у last_timings().
+    """
+    import aiohttp
+
+    def timings(context):
+        ctx = context.trace_request_ctx
+        return ctx if isinstance(ctx, dict) else None
+
+    async def on_request_start(session, context, params):
+        _stats.record_request()
+
+    async def on_dns_resolvehost_start(session, context, params):
+        context.dns_started = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, context, params):
+        ctx = timings(context)
+        if ctx is not None and hasattr(context, "dns_started"):
+            ctx["dns"] = time.perf_counter() - context.dns_started
+
+    async def on_connection_create_start(session, context, params):
+        context.connect_started = time.perf_counter()
+
+    async def on_connection_create_end(session, context, params):
+        _stats.record_connection()
+        ctx = timings(context)
+        if ctx is not None and hasattr(context, "connect_started"):
+            ctx["connect"] = time.perf_counter() - context.connect_started - (ctx.get("dns") or 0.0)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    return trace_config
+
+
+def stats():
+    """Статистика запросов и переиспользования соединений"""
+    return _stats.snapshot()
+
+
+def format_stats():
+    s = stats()
+    return (f"{s['requests']} запросов, {s['new_connections']} новых соединений, "
+            f"переиспользовано {s['reused']} ({s['reuse_ratio']:.0%})")
@@ -0,0 +1,121 @@
+"""
+param_synth.py — подстановка значений в шаблонные пути по схеме параметров.
+
+Для каждого {параметра} пути строится короткий ранжированный список значений:
+сначала то, что объявлено в спецификации (example, default, enum), затем
+значения по format/type и, наконец, эвристики по имени (id, slug, uuid, ...).
+Варианты URL собираются «по диагонали» — i-й вариант берёт i-е значение
+каждого параметра, — и ограничиваются max_variants на шаблон. Обязательные
+query-параметры дописываются первым значением из того же списка.
+
+    synthesize_urls("https://host/api/users/{userId}", params)
+    # ['https://host/api/users/42', 'https://host/api/users/1', ...]
+"""
+
+import re
+from urllib.parse import quote, urlencode
+
+DEFAULT_MAX_VARIANTS = 4
+
+TEMPLATE_PARAM = re.compile(r'\{([^}]+)\}')
+
+# Эвристики по имени параметра: (шаблон имени, значения) — первое совпадение
+_NAME_HINTS = [
+    (re.compile(r'uuid|guid', re.I), ['00000000-0000-0000-0000-000000000001']),
+    (re.compile(r'(?:^|[_-])[iI][dD](?:$|[_-])|[a-z]I[dD](?:$|[A-Z_])'), [1, 2, 'me']),
+    (re.compile(r'user(name)?$|login|account|owner', re.I), ['me', 'admin', 1]),
+    (re.compile(r'e-?mail', re.I), ['test@example.com']),
+    (re.compile(r'slug|name|key|code', re.I), ['test', 'default', 1]),
+    (re.compile(r'lang|locale', re.I), ['en', 'en-US']),
+    (re.compile(r'version|ver$', re.I), ['v1', 1]),
+    (re.compile(r'date', re.I), ['2024-01-01']),
+    (re.compile(r'page|number|num|no$|count|size|limit|offset|year', re.I), [1, 2]),
+]
+
+_FORMAT_VALUES = {
+    'uuid': ['00000000-0000-0000-0000-000000000001'],
+    'int32': [1, 2],
+    'int64': [1, 2],
+    'date': ['2024-01-01'],
+    'date-time': ['2024-01-01T00:00:00Z'],
+    'email': ['test@example.com'],
+}
+
+_TYPE_VALUES = {
+    'integer': [1, 2],
+    'number': [1, 2],
+    'boolean': ['true', 'false'],
+}
+
+_FALLBACK_VALUES = [1, 'test']
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _name_hint(name):
+    for pattern, values in _NAME_HINTS:
+        if pattern.search(name):
+            return values
+    return []
+
+
+def candidate_values(name, param=None, limit=DEFAULT_MAX_VARIANTS):
+    """Ранжированные значения параметра: спецификация → format/type → имя → запасные"""
+    param = param or {}
+    ranked = []
+    for key in ('example', 'default'):
+        if param.get(key) is not None:
+            ranked.append(param[key])
+    ranked.extend(param.get('enum') or [])
+    # enum — закрытый список: ничего сверх него сервер не примет
+    if not param.get('enum'):
+        ranked.extend(_FORMAT_VALUES.get(param.get('format'), []))
+        type_values = _TYPE_VALUES.get(param.get('type'))
+        if type_values:
+            ranked.extend(type_values)
+        else:
+            ranked.extend(_name_hint(name))
+            ranked.extend(_FALLBACK_VALUES)
+    values = [_format_value(v) for v in ranked if isinstance(v, (str, int, float, bool))]
+    if not values:
+        # Ни одного пригодного значения (например, enum из null и объектов) — эвристики по имени
+        values = [_format_value(v) for v in _name_hint(name) + _FALLBACK_VALUES]
+    return list(dict.fromkeys(values))[:limit]
+
+
+def _params_by_name(params, location):
+    return {p['name']: p for p in (params or {}).get(location) or [] if p.get('name')}
+
+
+def synthesize_urls(url, params=None, max_variants=DEFAULT_MAX_VARIANTS):
+    """Конкретные URL для шаблонного пути (без шаблона — сам URL)
+
+    params — словарь {"path": [...], "query": [...]} из spec_index.Endpoint.
+    """
+    names = list(dict.fromkeys(TEMPLATE_PARAM.findall(url)))
+    query = ''
+    required_query = [p for p in _params_by_name(params, 'query').values() if p.get('required')]
+    if required_query:
+        query_values = {}
+        for param in required_query:
+            values = candidate_values(param['name'], param, 1)
+            if values:
+                query_values[param['name']] = values[0]
+        if query_values:
+            query = ('&' if '?' in url else '?') + urlencode(query_values)
+    if not names:
+        return [url + query]
+
+    path_params = _params_by_name(params, 'path')
+    choices = {name: candidate_values(name, path_params.get(name), max_variants) for name in names}
+    depth = max(len(values) for values in choices.values())
+    variants = []
+    for i in range(min(depth, max_variants)):
+        filled = {name: values[min(i, len(values) - 1)] for name, values in choices.items()}
+        variant = TEMPLATE_PARAM.sub(lambda m: quote(filled[m.group(1)], safe=''), url)
+        variants.append(variant + query)
+    return list(dict.fromkeys(variants))
@@ -0,0 +1,201 @@
+"""
+scan_log.py — общий вывод для swagger и graphql чекеров.
+
+Рабочие потоки не пишут в stdout сами и не берут общую блокировку: log()
+только кладёт строку в очередь, фоновый поток печатает накопленное пачками.
+Уровни: QUIET (видно даже с -q: находки, итоги), NORMAL (вывод по умолчанию),
+VERBOSE (только с -v). count() копит счётчики для строки прогресса, которая
+раз в секунду перерисовывается в stderr (если stderr — терминал или --progress).
+
+    import scan_log
+    scan_log.add_arguments(parser)
+    args = parser.parse_args()
+    scan_log.configure_from_args(args)
+    scan_log.log("[✓ SUCCESS] ...", scan_log.QUIET)
+    scan_log.count("hits")
+    scan_log.flush()   # дождаться, пока всё выведено
+"""
+
+import argparse
+import atexit
+import queue
+import sys
+import threading
+import time
+
+QUIET, NORMAL, VERBOSE = 0, 1, 2
+
+# Счётчики строки прогресса
+REQUESTS = "requests"
+HITS = "hits"
+ERRORS = "errors"
+
+_CLOSE = object()
+_COUNT = "count"
+_FLUSH = "flush"
+
+BATCH_SIZE = 1000
+PROGRESS_INTERVAL = 1.0
+
+
+class ScanLog:
+    """Очередь сообщений + фоновый поток вывода + строка прогресса"""
+
+    def __init__(self, level=NORMAL, progress=None, stream=None, progress_stream=None,
+                 interval=PROGRESS_INTERVAL):
+        self.level = level
+        self.stream = stream or sys.stdout
+        self.progress_stream = progress_stream or sys.stderr
+        if progress is None:
+            progress = self.progress_stream.isatty()
+        self.progress = progress
+        self.interval = interval
+        self.counters = {REQUESTS: 0, HITS: 0, ERRORS: 0}
+        self._started = time.monotonic()
+        self._rendered_at = self._started
+        self._rendered_counters = dict(self.counters)
+        self._progress_shown = False
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="scan-log", daemon=True)
+        self._thread.start()
+
+    def enabled(self, level):
+        return level <= self.level
+
+    def log(self, message, level=NORMAL):
+        if level <= self.level:
+            self._queue.put(str(message))
+
+    def count(self, counter, n=1):
+        self._queue.put((_COUNT, counter, n))
+
+    def flush(self):
+        """Блокируется, пока всё поставленное в очередь не выведено"""
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put((_FLUSH, done, 0))
+            done.wait()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+
+    def _run(self):
+        closing = False
+        while not closing:
+            lines, flushed = [], []
+            try:
+                item = self._queue.get(timeout=self.interval if self.progress else None)
+                while True:
+                    if item is _CLOSE:
+                        closing = True
+                        break
+                    if isinstance(item, tuple):
+                        kind, key, n = item
+                        if kind == _COUNT:
+                            self.counters[key] = self.counters.get(key, 0) + n
+                        else:
+                            flushed.append(key)
+                    else:
+                        lines.append(item)
+                    if len(lines) >= BATCH_SIZE:
+                        break
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if lines:
+                self._write(lines)
+            if self.progress and (closing or time.monotonic() - self._rendered_at >= self.interval):
+                self._render()
+            for done in flushed:
+                done.set()
+        if self._progress_shown:
+            self.progress_stream.write("\n")
+            self.progress_stream.flush()
+
+    def _write(self, lines):
+        if self._progress_shown:
+            # Стираем строку прогресса, чтобы сообщения не склеивались с ней
+            self.progress_stream.write("\r\033[K")
+            self.progress_stream.flush()
+            self._progress_shown = False
+        self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+
+    def _render(self):
+        now = time.monotonic()
+        elapsed = max(now - self._rendered_at, 1e-6)
+        parts = []
+        for key in (REQUESTS, HITS, ERRORS):
+            total = self.counters.get(key, 0)
+            rate = (total - self._rendered_counters.get(key, 0)) / elapsed
+            parts.append(f"{key} {total} ({rate:.1f}/s)")
+        self._rendered_at = now
+        self._rendered_counters = dict(self.counters)
+        self.progress_stream.write(f"\r\033[K[PROGRESS] {int(now - self._started)}s | " + " | ".join(parts))
+        self.progress_stream.flush()
+        self._progress_shown = True
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def configure(level=NORMAL, progress=None):
+    """Создаёт (или пересоздаёт) общий логгер; прежний дописывает очередь и закрывается"""
+    global _log
+    with _log_lock:
+        if _log is not None:
+            _log.close()
+        _log = ScanLog(level=level, progress=progress)
+    return _log
+
+
+def get_log():
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = ScanLog(progress=False)
+    return _log
+
+
+def add_arguments(parser):
+    """Флаги -q / -v / --progress для argparse"""
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("-q", "--quiet", action="store_true",
+                           help="Тихий режим: только находки и итоги")
+    verbosity.add_argument("-v", "--verbose", action="store_true",
+                           help="Подробный режим: дополнительно детали каждого запроса")
+    parser.add_argument("--progress", action=argparse.BooleanOptionalAction, default=None,
+                        help="Строка прогресса в stderr (по умолчанию: если stderr — терминал)")
+
+
+def configure_from_args(args):
+    level = QUIET if args.quiet else VERBOSE if args.verbose else NORMAL
+    return configure(level=level, progress=args.progress)
+
+
+def log(message, level=NORMAL):
+    get_log().log(message, level)
+
+
+def enabled(level):
+    return get_log().enabled(level)
+
+
+def count(counter, n=1):
+    get_log().count(counter, n)
+
+
+def flush():
+    get_log().flush()
+
+
+def close():
+    if _log is not None:
+        _log.close()
+
+
+atexit.register(close)
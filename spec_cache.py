@@ -0,0 +1,208 @@
+"""
+spec_cache.py — постоянный кэш Swagger/OpenAPI спецификаций на диске (SQLite).
+
+Для каждого URL спецификации хранит распарсенный документ (zlib + JSON) и
+валидаторы ETag / Last-Modified, чтобы при повторном запуске отправлять
+условный запрос и получать 304 вместо многомегабайтного тела. Также помнит,
+какой кандидат из generate_swagger_urls сработал для каждого хоста, и ведёт
+негативный кэш кандидатов (host, path), которые отвечали 404 или не-спецификацией.
+
+    cache = SpecCache(".swagger_cache")
+    entry = cache.get(url)                        # None или {"spec", "etag", ...}
+    headers.update(cache.conditional_headers(entry))
+    ...
+    cache.store(url, spec, response.headers)      # после 200
+    cache.close()                                 # вытеснение по возрасту/размеру
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CACHE_DIR = ".swagger_cache"
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_MAX_MB = 512
+DEFAULT_DEAD_TTL_HOURS = 72
+
+# Исходы проверки кандидата; DEAD_OUTCOMES пропускаются, пока запись моложе TTL
+OUTCOME_SPEC = "spec"
+OUTCOME_MISSING = "missing"      # 404 / 410
+OUTCOME_NOT_SPEC = "not_spec"    # 200, но не Swagger/OpenAPI (SPA fallback и т.п.)
+OUTCOME_ERROR = "error"          # прочие статусы, таймауты, ошибки соединения
+DEAD_OUTCOMES = (OUTCOME_MISSING, OUTCOME_NOT_SPEC)
+
+_FLUSH_EVERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS specs (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    spec          BLOB NOT NULL,
+    size          INTEGER NOT NULL,
+    fetched_at    REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hosts (
+    host       TEXT PRIMARY KEY,
+    spec_url   TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidates (
+    host       TEXT NOT NULL,
+    path       TEXT NOT NULL,
+    status     INTEGER,
+    outcome    TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (host, path)
+);
+"""
+
+
+class SpecCache:
+    """Потокобезопасный кэш спецификаций: одно соединение SQLite под блокировкой"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_age_days=DEFAULT_MAX_AGE_DAYS,
+                 max_mb=DEFAULT_MAX_MB, dead_ttl_hours=DEFAULT_DEAD_TTL_HOURS):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "specs.sqlite3")
+        self.max_age = max_age_days * 86400
+        self.max_bytes = max_mb * 1024 * 1024
+        self.dead_ttl = dead_ttl_hours * 3600
+        self.hits = 0
+        self.skipped_candidates = 0
+        self._pending_candidates = []
+        self._lock = threading.Lock()
+        # timeout: при --workers один файл кэша пишут несколько процессов
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self.evict()
+
+    # === Спецификации ===
+    def get(self, url):
+        """Возвращает запись кэша для URL спецификации или None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, spec FROM specs WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE specs SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+        etag, last_modified, blob = row
+        try:
+            spec = json.loads(zlib.decompress(blob))
+        except (zlib.error, ValueError):
+            return None
+        return {"etag": etag, "last_modified": last_modified, "spec": spec}
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Заголовки If-None-Match / If-Modified-Since для ревалидации записи"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, spec, response_headers):
+        """Сохраняет спецификацию, если у ответа есть валидаторы для ревалидации"""
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+        blob = zlib.compress(json.dumps(spec, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO specs (url, etag, last_modified, spec, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, blob, len(blob), now, now),
+            )
+            self._db.commit()
+        return True
+
+    def record_hit(self):
+        """Учитывает ответ 304 — спецификация взята из кэша"""
+        with self._lock:
+            self.hits += 1
+
+    # === Успешные кандидаты по хостам ===
+    def remember_candidate(self, host, spec_url):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO hosts (host, spec_url, updated_at) VALUES (?, ?, ?)",
+                (host, spec_url, time.time()),
+            )
+            self._db.commit()
+
+    def preferred_candidate(self, host):
+        """URL спецификации, найденной для хоста в прошлый раз, или None"""
+        with self._lock:
+            row = self._db.execute("SELECT spec_url FROM hosts WHERE host = ?", (host,)).fetchone()
+        return row[0] if row else None
+
+    # === Негативный кэш кандидатов ===
+    def record_candidate(self, host, path, status, outcome):
+        """Запоминает исход проверки кандидата; запись в БД — пачками"""
+        with self._lock:
+            self._pending_candidates.append((host, path, status, outcome, time.time()))
+            if len(self._pending_candidates) >= _FLUSH_EVERY:
+                self._flush_candidates()
+
+    def _flush_candidates(self):
+        # Вызывается под self._lock
+        if self._pending_candidates:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO candidates (host, path, status, outcome, checked_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._pending_candidates,
+            )
+            self._db.commit()
+            self._pending_candidates = []
+
+    def candidate_history(self, host):
+        """Свежие (моложе TTL) исходы кандидатов хоста: {path: outcome}"""
+        cutoff = time.time() - self.dead_ttl
+        with self._lock:
+            self._flush_candidates()
+            rows = self._db.execute(
+                "SELECT path, outcome FROM candidates WHERE host = ? AND checked_at >= ?",
+                (host, cutoff),
+            ).fetchall()
+        return dict(rows)
+
+    def record_skipped(self, count):
+        with self._lock:
+            self.skipped_candidates += count
+
+    # === Вытеснение ===
+    def evict(self):
+        """Удаляет записи старше max_age и самые давние по использованию сверх max_bytes"""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            self._db.execute("DELETE FROM specs WHERE accessed_at < ?", (cutoff,))
+            self._db.execute("DELETE FROM hosts WHERE updated_at < ?", (cutoff,))
+            self._flush_candidates()
+            self._db.execute("DELETE FROM candidates WHERE checked_at < ?", (time.time() - self.dead_ttl,))
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM specs").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._db.execute("SELECT url, size FROM specs ORDER BY accessed_at").fetchall()
+                for url, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM specs WHERE url = ?", (url,))
+                    total -= size
+            self._db.commit()
+
+    def close(self):
+        self.evict()
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,217 @@
+"""
+spec_index.py — компиляция Swagger 2 / OpenAPI 3 спецификации в компактный индекс.
+
+Индекс строится один раз на спецификацию и содержит:
+  * все базовые URL: servers (с подстановкой переменных) для OpenAPI 3,
+    schemes × host × basePath для Swagger 2 — относительные разрешаются
+    от URL самой спецификации, loopback-хосты отбрасываются;
+  * для каждого пути — HTTP методы и параметры path/query с раскрытыми
+    $ref (name, required, type, format, enum, example, default).
+
+    index = compile_spec(data, spec_url)
+    for endpoint in index.endpoints():
+        endpoint.url, endpoint.methods, endpoint.params
+"""
+
+import re
+from collections import namedtuple
+from datetime import date
+from itertools import product
+from urllib.parse import urljoin, urlparse
+
+HTTP_METHODS = ('get', 'post', 'put', 'delete', 'patch', 'head', 'options')
+
+# Хосты из спецификации, на которые заведомо нет смысла слать запросы снаружи
+_LOOPBACK_HOSTS = ('localhost', '127.0.0.1', '0.0.0.0', '::1', '[::1]')
+_MAX_SERVER_VARIANTS = 8
+# {region} без default и enum остаётся в URL: такой базовый URL не проверяем
+_UNRESOLVED_VARIABLE = re.compile(r'\{[^{}]*\}')
+
+# params: {"path": [param, ...], "query": [param, ...]}, param — словарь из _compact_param;
+# source — URL спецификации, из которой взят эндпоинт
+Endpoint = namedtuple('Endpoint', ['url', 'methods', 'params', 'source'])
+Endpoint.__new__.__defaults__ = (None, None)
+
+PathEntry = namedtuple('PathEntry', ['path', 'methods', 'params'])
+
+
+class SpecIndex:
+    def __init__(self, spec_url, version, bases, paths):
+        self.spec_url = spec_url
+        self.version = version
+        self.bases = bases      # список базовых URL без завершающего /
+        self.paths = paths      # список PathEntry
+
+    def endpoints(self):
+        """Эндпоинты для всех комбинаций базовый URL × путь (без дублей)"""
+        seen = set()
+        result = []
+        for base in self.bases:
+            for entry in self.paths:
+                url = base + entry.path
+                if url not in seen:
+                    seen.add(url)
+                    result.append(Endpoint(url, list(entry.methods), entry.params, self.spec_url))
+        return result
+
+
+def resolve_ref(spec, obj, depth=0):
+    """Раскрывает локальный $ref ("#/components/parameters/Id") — рекурсивно, с ограничением глубины"""
+    while isinstance(obj, dict) and '$ref' in obj and depth < 16:
+        ref = obj['$ref']
+        if not isinstance(ref, str) or not ref.startswith('#/'):
+            return {}
+        target = spec
+        for part in ref[2:].split('/'):
+            part = part.replace('~1', '/').replace('~0', '~')
+            if not isinstance(target, dict) or part not in target:
+                return {}
+            target = target[part]
+        obj = target
+        depth += 1
+    return obj if isinstance(obj, dict) else {}
+
+
+def _is_usable_host(netloc, spec_netloc):
+    host = netloc.rsplit('@', 1)[-1].split(':')[0].lower() if not netloc.startswith('[') else netloc
+    if not host:
+        return False
+    # loopback из спецификации пропускаем, если сама спецификация не на loopback
+    spec_host = spec_netloc.split(':')[0].lower()
+    return host not in _LOOPBACK_HOSTS or spec_host in _LOOPBACK_HOSTS
+
+
+def _expand_server_variables(url, variables):
+    """Подставляет переменные сервера OpenAPI 3: default и значения enum (не больше _MAX_SERVER_VARIANTS)"""
+    if not variables:
+        return [url]
+    names, choices = [], []
+    for name, var in variables.items():
+        if not isinstance(var, dict):
+            continue
+        values = [var.get('default')] + list(var.get('enum') or [])
+        values = [str(v) for v in dict.fromkeys(values) if v is not None]
+        if values:
+            names.append(name)
+            choices.append(values)
+    urls = []
+    for combo in product(*choices):
+        expanded = url
+        for name, value in zip(names, combo):
+            expanded = expanded.replace('{' + name + '}', value)
+        urls.append(expanded)
+        if len(urls) >= _MAX_SERVER_VARIANTS:
+            break
+    return urls or [url]
+
+
+def spec_bases(spec, spec_url):
+    """Все базовые URL, на которых по спецификации живёт API"""
+    parsed_spec_url = urlparse(spec_url)
+    origin = f"{parsed_spec_url.scheme}://{parsed_spec_url.netloc}"
+    candidates = []
+
+    servers = spec.get('servers')
+    if spec.get('openapi') and isinstance(servers, list) and servers:
+        for server in servers:
+            if not isinstance(server, dict) or not isinstance(server.get('url'), str):
+                continue
+            for url in _expand_server_variables(server['url'], server.get('variables')):
+                url = urljoin(spec_url, url)
+                candidates.append(url)
+                # Документация почти всегда отдаётся тем же origin, что и API
+                candidates.append(origin + urlparse(url).path)
+    elif spec.get('swagger'):
+        base_path = spec.get('basePath') or ''
+        if not isinstance(base_path, str):
+            base_path = ''
+        if base_path and not base_path.startswith('/'):
+            base_path = '/' + base_path
+        host = spec.get('host') if isinstance(spec.get('host'), str) else None
+        schemes = [s for s in (spec.get('schemes') or []) if s in ('http', 'https')]
+        if host:
+            for scheme in schemes or [parsed_spec_url.scheme]:
+                candidates.append(f"{scheme}://{host}{base_path}")
+        # Документация почти всегда отдаётся тем же origin, что и API
+        candidates.append(origin + base_path)
+
+    bases = []
+    for url in candidates:
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or not _is_usable_host(parsed.netloc, parsed_spec_url.netloc):
+            continue
+        if _UNRESOLVED_VARIABLE.search(parsed.netloc + parsed.path):
+            continue
+        bases.append(f"{parsed.scheme}://{parsed.netloc}{parsed.path}".rstrip('/'))
+    return list(dict.fromkeys(bases)) or [origin]
+
+
+def _scalar(value):
+    """Значение параметра как JSON-скаляр: дата — ISO-строкой, объекты и списки — None"""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value if isinstance(value, (str, int, float, bool)) else None
+
+
+def _compact_param(spec, param):
+    """Только то, что нужно для подстановки значений: тип, формат, enum, пример"""
+    schema = resolve_ref(spec, param.get('schema')) if 'schema' in param else param
+    if schema.get('type') == 'array':
+        items = resolve_ref(spec, schema.get('items'))
+        enum = items.get('enum')
+    else:
+        enum = schema.get('enum')
+    example = param.get('example', schema.get('example'))
+    if example is None and isinstance(param.get('examples'), dict):
+        for sample in param['examples'].values():
+            sample = resolve_ref(spec, sample)
+            if 'value' in sample:
+                example = sample['value']
+                break
+    if isinstance(enum, list):
+        # Параметры уходят в журнал (JSON), поэтому enum чистим так же, как example/default
+        enum = [value for value in map(_scalar, enum) if value is not None] or None
+    else:
+        enum = None
+    return {
+        'name': param.get('name'),
+        'required': bool(param.get('required')),
+        'type': schema.get('type'),
+        'format': schema.get('format'),
+        'enum': enum,
+        'example': _scalar(example),
+        'default': _scalar(schema.get('default')),
+    }
+
+
+def _operation_params(spec, path_item, operation):
+    """Параметры path/query операции: параметры пути переопределяются параметрами операции"""
+    merged = {}
+    for source in (path_item.get('parameters'), operation.get('parameters')):
+        for raw in source or []:
+            param = resolve_ref(spec, raw)
+            if param.get('in') in ('path', 'query') and param.get('name'):
+                merged[(param['in'], param['name'])] = _compact_param(spec, param)
+    params = {'path': [], 'query': []}
+    for (location, _), param in merged.items():
+        params[location].append(param)
+    return params
+
+
+def compile_spec(spec, spec_url):
+    """Строит SpecIndex по распарсенной спецификации"""
+    paths = []
+    for path, path_item in (spec.get('paths') or {}).items():
+        path_item = resolve_ref(spec, path_item)
+        if not isinstance(path, str) or not path_item:
+            continue
+        methods = [m for m in path_item if isinstance(m, str) and m.lower() in HTTP_METHODS]
+        if not methods:
+            continue
+        # Параметры берём у GET — только GET-эндпоинты проверяются; иначе у первого метода
+        operation = resolve_ref(spec, path_item.get('get') or path_item.get(methods[0]))
+        params = _operation_params(spec, path_item, operation)
+        if not path.startswith('/'):
+            path = '/' + path
+        paths.append(PathEntry(path, [m.lower() for m in methods], params))
+    return SpecIndex(spec_url, spec.get('swagger') or spec.get('openapi'), spec_bases(spec, spec_url), paths)
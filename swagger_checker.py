@@ -0,0 +1,1408 @@
+"""
+swagger_checker.py — поиск Swagger/OpenAPI спецификаций и проверка их GET-эндпоинтов.
+
+Модуль импортируется без побочных эффектов; два итератора можно встраивать
+в свои конвейеры без подпроцессов и промежуточных файлов:
+
+    import swagger_checker as sc
+    endpoints = sc.discover(["https://host/swagger/index.html"], workers=8)
+    for result in sc.probe(endpoints, workers=32):
+        print(result.endpoint.url, result.hits)
+
+    async for result in sc.probe_async(endpoints, concurrency=100):   # свой event loop
+        ...
+
+CLI (swagger_checker_threads.py и swagger_checker_threads_v2.py — обёртки над ним):
+
+    python swagger_checker.py -i swagger_endpoints.txt -o swagger_get_200.txt -t 100
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import queue
+import urllib3
+import re
+import argparse
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict, namedtuple
+from functools import partial
+
+import host_limiter
+import catch_all
+import http_pool
+import param_synth
+import scan_log
+from batch_writer import BatchedLineWriter
+import spec_cache
+from spec_cache import SpecCache
+from host_limiter import HostLimiter, HostScheduler
+from spec_index import Endpoint, compile_spec
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp нужен только для --engine async
+    aiohttp = None
+
+try:
+    import yaml
+except ImportError:  # без PyYAML YAML-спецификации пропускаются
+    yaml = None
+
+if yaml is not None:
+    # C-загрузчик libyaml в разы быстрее чистого Python
+    class YamlLoader(getattr(yaml, 'CSafeLoader', yaml.SafeLoader)):
+        """SafeLoader без дат: `example: 2024-01-01` остаётся строкой, как в JSON,
+        иначе datetime.date не сериализуется в кэш и журнал"""
+    
+    _YAML_TIMESTAMP = 'tag:yaml.org,2002:timestamp'
+    YamlLoader.yaml_implicit_resolvers = {
+        first: [(tag, regexp) for tag, regexp in resolvers if tag != _YAML_TIMESTAMP]
+        for first, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+    }
+    # Явный !!timestamp — тоже строка
+    YamlLoader.add_constructor(_YAML_TIMESTAMP, yaml.SafeLoader.construct_yaml_str)
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0"
+}
+
+# Вывод идёт через общую очередь scan_log (без блокировки в рабочих потоках);
+# прежнее имя оставлено, уровень — вторым аргументом: thread_safe_print(msg, scan_log.QUIET)
+thread_safe_print = scan_log.log
+
+# Кэш спецификаций на диске (spec_cache.py); None — кэш выключен (--no-cache)
+_spec_cache = None
+
+def set_spec_cache(cache):
+    """Включает (SpecCache) или выключает (None) кэш спецификаций"""
+    global _spec_cache
+    _spec_cache = cache
+
+def get_spec_response(spec_url):
+    """GET спецификации с ревалидацией по кэшу; возвращает (response, спецификация из кэша или None)"""
+    entry = _spec_cache.get(spec_url) if _spec_cache else None
+    headers = {**HEADERS, **SpecCache.conditional_headers(entry)}
+    response = http_pool.get(spec_url, headers=headers, verify=False, timeout=10)
+    if response.status_code == 304 and entry:
+        _spec_cache.record_hit()
+        thread_safe_print(f"[CACHE] Спецификация не изменилась: {spec_url}")
+        return response, entry["spec"]
+    return response, None
+
+# Ограничитель нагрузки на хосты при проверке эндпоинтов; None — без ограничений
+_host_limiter = None
+
+def set_host_limiter(limiter):
+    """Включает (HostLimiter) или выключает (None) ограничение нагрузки на хосты"""
+    global _host_limiter
+    _host_limiter = limiter
+
+# Построчный JSONL-лог запросов (--jsonl): BatchedLineWriter или None
+_probe_log = None
+
+def set_probe_log(writer):
+    """Включает (BatchedLineWriter) или выключает (None) JSONL-лог запросов"""
+    global _probe_log
+    _probe_log = writer
+
+# Детектор catch-all хостов (None — выключен, --no-catch-all)
+_catch_all = None
+
+def set_catch_all_detector(detector):
+    """Включает (CatchAllDetector) или выключает (None) распознавание catch-all хостов"""
+    global _catch_all
+    _catch_all = detector
+
+def host_of(endpoint):
+    """Хост (host:port) эндпоинта — ключ для ограничителя и планировщика"""
+    return urlparse(endpoint[0]).netloc
+
+def cache_spec(spec_url, data, response):
+    """Сохраняет свежескачанную спецификацию в кэш; ошибка записи не прерывает разбор"""
+    if _spec_cache:
+        try:
+            _spec_cache.store(spec_url, data, response.headers)
+        except Exception as e:
+            thread_safe_print(f"[CACHE] Не удалось сохранить {spec_url}: {e}")
+
+def get_base_from_url(swagger_url):
+    """Извлекает базовый URL из полного URL"""
+    parsed = urlparse(swagger_url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+# Маркеры встроенной спецификации в swagger-ui-init.js и похожих бандлах:
+# "swaggerDoc": {...}, swaggerDoc: {...}, "spec": {...}, spec: {...}
+SWAGGER_JS_MARKER = re.compile(r'\b(?:swaggerDoc|spec)["\']?\s*:\s*(?=\{)')
+_json_decoder = json.JSONDecoder()
+
+def extract_swaggers_from_js(js_content):
+    """Извлекает все встроенные Swagger спецификации из JavaScript кода"""
+    specs = []
+    parsed_until = 0
+    for match in SWAGGER_JS_MARKER.finditer(js_content):
+        if match.start() < parsed_until:
+            continue  # маркер внутри уже разобранной спецификации
+        try:
+            # raw_decode (C-сканер) сам учитывает строки и экранирование
+            data, parsed_until_candidate = _json_decoder.raw_decode(js_content, match.end())
+        except ValueError:
+            continue  # JS-объект, а не JSON (например, spec: {url: ...})
+        if is_swagger_spec(data):
+            specs.append(data)
+            parsed_until = parsed_until_candidate
+    return specs
+
+def merge_specs(specs):
+    """Объединяет несколько встроенных спецификаций: первая + пути остальных"""
+    if len(specs) == 1:
+        return specs[0]
+    merged = dict(specs[0])
+    merged['paths'] = dict(specs[0].get('paths', {}))
+    for spec in specs[1:]:
+        for path, item in spec.get('paths', {}).items():
+            merged['paths'].setdefault(path, item)
+    return merged
+
+def extract_swagger_from_js(js_content):
+    """Извлекает Swagger спецификацию из JavaScript кода (несколько — объединяются)"""
+    specs = extract_swaggers_from_js(js_content)
+    return merge_specs(specs) if specs else None
+
+def generate_swagger_urls(swagger_ui_url):
+    """Генерирует возможные пути к Swagger спецификации (JSON и JS)"""
+    base_url = get_base_from_url(swagger_ui_url)
+    parsed = urlparse(swagger_ui_url)
+    path = parsed.path.lower()
+    
+    json_urls = []
+    js_urls = []
+    
+    json_urls.extend([
+        f"{base_url}/swagger/v1/swagger.json",
+        f"{base_url}/swagger.json", 
+        f"{base_url}/v2/api-docs",
+        f"{base_url}/api-docs",
+        f"{base_url}/swagger/doc.json",
+        f"{base_url}/api/swagger.json",
+        f"{base_url}/openapi.json",
+        f"{base_url}/swagger/developer/swagger.json"
+    ])
+    
+    js_urls.extend([
+        f"{base_url}/swagger/swagger-ui-init.js",
+        f"{base_url}/api/swagger/swagger-ui-init.js", 
+        f"{base_url}/swagger-ui-init.js"
+    ])
+    
+    if path.endswith("/swagger-ui.js"):
+        json_urls.extend([
+            f"{base_url}/swagger.json",
+            f"{base_url}/v2/api-docs", 
+            f"{base_url}/api/swagger.json"
+        ])
+        js_urls.extend([
+            f"{base_url}/swagger-ui-init.js",
+            f"{base_url}/swagger/swagger-ui-init.js"
+        ])
+    
+    elif "/swagger/index.html" in path:
+        swagger_base = path.replace("/index.html", "")
+        json_urls.extend([
+            f"{base_url}{swagger_base}/v1/swagger.json",
+            f"{base_url}{swagger_base}/swagger.json",
+            f"{base_url}{swagger_base}/doc.json"
+        ])
+        js_urls.append(f"{base_url}{swagger_base}/swagger-ui-init.js")
+    
+    elif path.endswith("/api/swagger"):
+        api_base = path.replace("/swagger", "")
+        json_urls.extend([
+            f"{base_url}{api_base}/swagger.json",
+            f"{base_url}{api_base}/swagger/swagger.json", 
+            f"{base_url}{api_base}/v2/api-docs"
+        ])
+        js_urls.append(f"{base_url}/api/swagger/swagger-ui-init.js")
+    
+    elif "swagger" in path:
+        if path.endswith(('.js', '.html', '.htm')):
+            json_path = path.rsplit('.', 1)[0] + '.json'
+            json_urls.append(f"{base_url}{json_path}")
+        
+        dir_path = '/'.join(path.split('/')[:-1])
+        if dir_path:
+            json_urls.append(f"{base_url}{dir_path}/swagger.json")
+            json_urls.append(f"{base_url}{dir_path}/swagger.yaml")
+            js_urls.append(f"{base_url}{dir_path}/swagger-ui-init.js")
+    
+    json_urls = list(dict.fromkeys(json_urls))
+    js_urls = list(dict.fromkeys(js_urls))
+    
+    return json_urls, js_urls
+
+def is_non_empty_json(text):
+    """Проверяет, что текст является непустым JSON"""
+    try:
+        if text.strip():
+            json_data = json.loads(text)
+            if isinstance(json_data, dict):
+                return len(json_data) > 0
+            elif isinstance(json_data, list):
+                return len(json_data) > 0
+            else:
+                return json_data is not None
+        return False
+    except:
+        return False
+
+# Сколько байт тела читать при проверке эндпоинта: меньшие тела проверяются полным
+# разбором JSON, у больших решение принимается по началу (sniff_non_empty_json)
+DEFAULT_MAX_BODY = 256 * 1024
+max_body_bytes = DEFAULT_MAX_BODY
+# Папка для сохранения тел подтверждённых ответов (--save-responses); None — не сохраняем
+save_responses_dir = None
+# Сколько конкретных URL подставлять на один шаблонный путь (--max-variants)
+max_param_variants = param_synth.DEFAULT_MAX_VARIANTS
+
+def configure_probe(max_body=DEFAULT_MAX_BODY, save_dir=None, max_variants=param_synth.DEFAULT_MAX_VARIANTS):
+    """Настраивает чтение тел ответов и подстановку параметров при проверке эндпоинтов"""
+    global max_body_bytes, save_responses_dir, max_param_variants
+    max_body_bytes = max_body
+    save_responses_dir = save_dir
+    max_param_variants = max_variants
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+
+def body_read_limit():
+    """Лимит чтения тела: без лимита, только если тела нужно сохранять"""
+    return None if save_responses_dir else max_body_bytes
+
+def read_body(response, limit):
+    """Читает тело потокового ответа requests; возвращает (байты, обрезано ли)"""
+    chunks, size = [], 0
+    for chunk in response.iter_content(chunk_size=65536):
+        chunks.append(chunk)
+        size += len(chunk)
+        if limit is not None and size > limit:
+            return b"".join(chunks)[:limit], True
+    return b"".join(chunks), False
+
+async def read_body_async(response, limit):
+    """Читает тело ответа aiohttp; возвращает (байты, обрезано ли)"""
+    chunks, size = [], 0
+    async for chunk in response.content.iter_chunked(65536):
+        chunks.append(chunk)
+        size += len(chunk)
+        if limit is not None and size > limit:
+            return b"".join(chunks)[:limit], True
+    return b"".join(chunks), False
+
+def sniff_non_empty_json(body, truncated):
+    """Непустой ли JSON: полный разбор для целого тела, по первым байтам — для обрезанного"""
+    if not truncated:
+        return is_non_empty_json(body)
+    head = body[len(codecs.BOM_UTF8):] if body.startswith(codecs.BOM_UTF8) else body
+    head = head.lstrip()
+    opener = head[:1]
+    if opener in (b'{', b'['):
+        # Тело больше лимита: "{}" / "[]" такими не бывают, смотрим на первый элемент
+        rest = head[1:].lstrip()
+        return bool(rest) and rest[:1] != (b'}' if opener == b'{' else b']')
+    # Огромная строка или число — тоже непустое значение
+    return bool(opener) and opener in b'"-0123456789tf'
+
+def save_response_body(check_url, body):
+    """Сохраняет тело подтверждённого ответа в save_responses_dir"""
+    digest = hashlib.sha1(check_url.encode()).hexdigest()[:12]
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', check_url.split('://', 1)[-1])[:150]
+    with open(os.path.join(save_responses_dir, f"{name}_{digest}.json"), "wb") as f:
+        f.write(body)
+
+def is_timeout_error(error):
+    """Проверяет, является ли исключение таймаутом (requests или asyncio)"""
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError)) or "timeout" in str(error).lower()
+
+# YAML-спецификация начинается (после комментариев/---) с ключа swagger: или openapi:
+YAML_SPEC_SNIFF = re.compile(rb'^(?:swagger|openapi)\s*:', re.MULTILINE)
+_PARSED_SPECS_MAX = 64
+_parsed_specs = OrderedDict()  # sha1 содержимого -> (спецификация, формат)
+_parsed_specs_lock = threading.Lock()
+
+def parse_spec_document(content):
+    """Разбирает JSON или YAML спецификацию по содержимому; возвращает (данные, 'json'|'yaml') или (None, None)"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    key = hashlib.sha1(content).digest()
+    with _parsed_specs_lock:
+        if key in _parsed_specs:
+            _parsed_specs.move_to_end(key)
+            return _parsed_specs[key]
+    
+    head = content[len(codecs.BOM_UTF8):] if content.startswith(codecs.BOM_UTF8) else content
+    head = head.lstrip()
+    result = (None, None)
+    if head[:1] in (b'{', b'['):
+        try:
+            result = (json.loads(head), 'json')
+        except ValueError:
+            pass
+    elif yaml is not None and YAML_SPEC_SNIFF.search(head[:4096]):
+        try:
+            result = (yaml.load(head, Loader=YamlLoader), 'yaml')
+        except yaml.YAMLError:
+            pass
+    
+    if result[0] is not None:
+        # Одинаковое содержимое (один спек по разным URL) разбираем один раз
+        with _parsed_specs_lock:
+            _parsed_specs[key] = result
+            if len(_parsed_specs) > _PARSED_SPECS_MAX:
+                _parsed_specs.popitem(last=False)
+    return result
+
+def is_swagger_spec(data):
+    """Проверяет, что распарсенный документ — Swagger/OpenAPI спецификация"""
+    return bool(data) and isinstance(data, dict) and 'paths' in data and bool(data.get('swagger') or data.get('openapi'))
+
+def download_candidate_spec(swagger_url, is_js, abandoned=None):
+    """Загружает один кандидат; возвращает (спецификация или None, HTTP статус или None)
+    
+    abandoned — событие гонки: если спецификация уже найдена, ответ не разбираем.
+    """
+    status = None
+    try:
+        thread_safe_print(f"[TRY] {swagger_url}")
+        response, cached = get_spec_response(swagger_url)
+        if cached:
+            return cached, response.status_code
+        status = response.status_code
+        if abandoned is not None and abandoned.is_set():
+            return None, None
+        
+        if response.status_code == 200:
+            data = None
+            
+            if is_js or swagger_url.endswith('.js'):
+                thread_safe_print(f"[JS] Парсим JavaScript файл")
+                data = extract_swagger_from_js(response.text)
+                if not data:
+                    thread_safe_print(f"[SKIP] SwaggerDoc не найден в JS")
+                    return None, status
+            else:
+                # Формат определяем по содержимому, а не по расширению или Content-Type
+                data, spec_format = parse_spec_document(response.content)
+                if spec_format == 'json':
+                    thread_safe_print(f"[JSON] Парсим JSON файл")
+                elif spec_format == 'yaml':
+                    thread_safe_print(f"[YAML] Парсим YAML файл")
+                else:
+                    content_type = response.headers.get('content-type', '').lower()
+                    thread_safe_print(f"[SKIP] Не JSON/YAML (Content-Type: {content_type})")
+                    return None, status
+            
+            if is_swagger_spec(data):
+                cache_spec(swagger_url, data, response)
+                return data, status
+            thread_safe_print(f"[SKIP] Не является Swagger спецификацией")
+        else:
+            if response.status_code not in [404, 403, 401]:
+                thread_safe_print(f"[{response.status_code}] {swagger_url}")
+                
+    except Exception as e:
+        if "404" not in str(e) and "403" not in str(e) and "timeout" not in str(e).lower():
+            thread_safe_print(f"[ERR] {swagger_url} → {e}")
+    
+    return None, status
+
+def fetch_candidate_spec(swagger_url, is_js, abandoned=None):
+    """Загружает один кандидат из generate_swagger_urls; возвращает спецификацию или None"""
+    if abandoned is not None and abandoned.is_set():
+        return None
+    data, status = download_candidate_spec(swagger_url, is_js, abandoned)
+    if abandoned is not None and abandoned.is_set() and not data:
+        return None  # проигравший гонку: исход кандидата неизвестен, в кэш не пишем
+    if _spec_cache:
+        if data:
+            outcome = spec_cache.OUTCOME_SPEC
+        elif status == 200:
+            outcome = spec_cache.OUTCOME_NOT_SPEC
+        elif status in (404, 410):
+            outcome = spec_cache.OUTCOME_MISSING
+        else:
+            outcome = spec_cache.OUTCOME_ERROR
+        _spec_cache.record_candidate(get_base_from_url(swagger_url), urlparse(swagger_url).path, status, outcome)
+    return data
+
+# Общий для всех источников пул гонки кандидатов: при -dt потоках поиска
+# одновременно скачивается не больше --race кандидатов, а не -dt × --race
+_race_executor = None
+_race_width = 0
+_race_lock = threading.Lock()
+
+def race_executor(race_width):
+    global _race_executor, _race_width
+    with _race_lock:
+        if _race_executor is None or _race_width != race_width:
+            if _race_executor is not None:
+                _race_executor.shutdown(wait=False)
+            _race_executor = ThreadPoolExecutor(max_workers=race_width, thread_name_prefix='spec-race')
+            _race_width = race_width
+        return _race_executor
+
+def race_candidate_specs(candidates, race_width):
+    """Запускает кандидатов параллельно (в порядке приоритета); побеждает первая валидная спецификация"""
+    abandoned = threading.Event()
+    executor = race_executor(race_width)
+    future_to_url = {
+        executor.submit(fetch_candidate_spec, swagger_url, is_js, abandoned): swagger_url
+        for swagger_url, is_js in candidates
+    }
+    try:
+        for future in as_completed(future_to_url):
+            data = future.result()
+            if data:
+                return future_to_url[future], data
+    finally:
+        # Ещё не начатые кандидаты отменяем, уже отправленные не разбирают ответ и не ждутся
+        abandoned.set()
+        for future in future_to_url:
+            future.cancel()
+    return None, None
+
+def endpoints_from_spec(data, spec_url):
+    """Эндпоинты спецификации по скомпилированному индексу: все серверы/basePath × пути"""
+    index = compile_spec(data, spec_url)
+    thread_safe_print(f"[INFO] API версия: {index.version}")
+    thread_safe_print(f"[INFO] Найдено эндпоинтов: {len(index.paths)}")
+    if len(index.bases) > 1:
+        thread_safe_print(f"[INFO] Базовые URL: {', '.join(index.bases)}")
+    return index.endpoints()
+
+def extract_paths_from_swagger(swagger_ui_url, race_width=0):
+    """Извлекает API пути из Swagger спецификации"""
+    paths = []
+    base_url = get_base_from_url(swagger_ui_url)
+    
+    thread_safe_print(f"\n[INFO] Обрабатываем: {swagger_ui_url}")
+    
+    json_urls, js_urls = generate_swagger_urls(swagger_ui_url)
+    candidates = [(url, False) for url in json_urls] + [(url, True) for url in js_urls]
+    
+    preferred = None
+    if _spec_cache:
+        # Заведомо мёртвые кандидаты (404 / не спецификация в пределах TTL) пропускаем,
+        # сработавший в прошлый раз и прочие исторически успешные — пробуем первыми
+        history = _spec_cache.candidate_history(base_url)
+        alive = [c for c in candidates if history.get(urlparse(c[0]).path) not in spec_cache.DEAD_OUTCOMES]
+        if len(alive) < len(candidates):
+            thread_safe_print(f"[CACHE] Пропущено заведомо мёртвых кандидатов: {len(candidates) - len(alive)}")
+            _spec_cache.record_skipped(len(candidates) - len(alive))
+        preferred = _spec_cache.preferred_candidate(base_url)
+        candidates = sorted(alive, key=lambda c: (c[0] != preferred,
+                                                  history.get(urlparse(c[0]).path) != spec_cache.OUTCOME_SPEC))
+    
+    winner_url, data = None, None
+    if race_width > 1:
+        winner_url, data = race_candidate_specs(candidates, race_width)
+    else:
+        for swagger_url, is_js in candidates:
+            data = fetch_candidate_spec(swagger_url, is_js)
+            if data:
+                winner_url = swagger_url
+                break
+    
+    if data:
+        if _spec_cache and winner_url != preferred:
+            _spec_cache.remember_candidate(base_url, winner_url)
+
+        thread_safe_print(f"[SUCCESS] Найдена спецификация!")
+        paths = endpoints_from_spec(data, winner_url)
+    else:
+        thread_safe_print(f"[WARNING] Swagger спецификация не найдена для {swagger_ui_url}!")
+    
+    return paths
+
+def load_direct_spec(spec_url):
+    """Загружает и парсит прямую ссылку на JSON/YAML-спецификацию"""
+    endpoints = []
+    
+    thread_safe_print(f"\n[INFO] Загружаем спецификацию напрямую: {spec_url}")
+    try:
+        response, cached = get_spec_response(spec_url)
+        if cached or response.status_code == 200:
+            data = cached or parse_spec_document(response.content)[0]
+            if is_swagger_spec(data):
+                if not cached:
+                    cache_spec(spec_url, data, response)
+                thread_safe_print(f"[SUCCESS] Найдена спецификация!")
+                endpoints = endpoints_from_spec(data, spec_url)
+            else:
+                thread_safe_print(f"[SKIP] Не является Swagger спецификацией: {spec_url}")
+        else:
+            thread_safe_print(f"[{response.status_code}] {spec_url}")
+    except Exception as e:
+        thread_safe_print(f"[ERR] {spec_url} → {e}")
+    
+    return endpoints
+
+def is_direct_spec_url(url):
+    """Определяет, является ли URL прямой ссылкой на JSON/YAML-спецификацию"""
+    lower = url.lower()
+    return (
+        lower.endswith('.json') or
+        lower.endswith('.yaml') or
+        lower.endswith('.yml') or
+        lower.endswith('/api-docs') or
+        'swagger.json' in lower or
+        'openapi.json' in lower or
+        'api-docs' in lower
+    )
+
+def build_sources(direct_spec_urls, swagger_ui_urls, race_width=0):
+    """Список (загрузчик, url): сначала прямые спецификации, затем Swagger UI URLs"""
+    extract_paths = partial(extract_paths_from_swagger, race_width=race_width)
+    sources = [(load_direct_spec, url) for url in direct_spec_urls]
+    sources += [(extract_paths, url) for url in swagger_ui_urls]
+    return sources
+
+def build_urls_to_check(endpoint):
+    """Конкретные URL для проверки эндпоинта: параметры подставляются по схеме из спецификации"""
+    url = endpoint[0]
+    params = endpoint[2] if len(endpoint) > 2 else None
+    urls_to_check = param_synth.synthesize_urls(url, params, max_param_variants)
+    
+    if urls_to_check != [url]:
+        thread_safe_print(f"\n[PARAM] Шаблон или обязательные параметры в: {url}")
+        thread_safe_print(f"[PARAM] Проверяем варианты: {urls_to_check}")
+    
+    return urls_to_check
+
+def is_probe_hit(status_code, content_type, body, truncated=False):
+    """200 с непустым JSON — кандидат в валидные эндпоинты"""
+    return status_code == 200 and 'application/json' in content_type.lower() and sniff_non_empty_json(body, truncated)
+
+def report_probe(check_url, status_code, content_type, body, truncated=False):
+    """Оценивает ответ и печатает результат; возвращает True для валидного эндпоинта"""
+    if status_code == 200:
+        if 'application/json' in content_type.lower():
+            if sniff_non_empty_json(body, truncated):
+                if _catch_all:
+                    verdict, first_url = _catch_all.classify(urlparse(check_url).netloc, check_url, body)
+                    if verdict == catch_all.VERDICT_BASELINE:
+                        thread_safe_print(f"[✗ CATCH-ALL] {check_url} (как ответ на случайный путь)")
+                        return False
+                    if verdict == catch_all.VERDICT_DUPLICATE:
+                        thread_safe_print(f"[✗ DUP] {check_url} (тело как у {first_url})")
+                        return False
+                thread_safe_print(f"[✓ SUCCESS] {check_url}", scan_log.QUIET)
+                scan_log.count(scan_log.HITS)
+                if save_responses_dir:
+                    save_response_body(check_url, body)
+                return True
+            thread_safe_print(f"[✗ EMPTY] {check_url} (JSON пустой)")
+        else:
+            thread_safe_print(f"[✗ NOT JSON] {check_url} (Content-Type: {content_type or 'unknown'})")
+    else:
+        thread_safe_print(f"[{status_code}] {check_url}")
+    return False
+
+def fetch_probe(check_url, timings=None):
+    """GET эндпоинта с учётом лимита хоста; возвращает (статус, Content-Type, тело, обрезано ли)
+    
+    В словарь timings (если передан) пишутся dns/connect/ttfb/total в секундах.
+    """
+    host = urlparse(check_url).netloc
+    if _host_limiter:
+        _host_limiter.acquire(host)
+    status, timed_out, retry_after = None, False, None
+    started = time.perf_counter()
+    scan_log.count(scan_log.REQUESTS)
+    try:
+        # stream=True: тело читаем сами и не дальше лимита
+        with http_pool.get(check_url, headers=HEADERS, verify=False, timeout=10, stream=True) as response:
+            if timings is not None:
+                timings['ttfb'] = time.perf_counter() - started
+            status = response.status_code
+            retry_after = host_limiter.parse_retry_after(response.headers.get('retry-after'))
+            content_type = response.headers.get('content-type', '')
+            body, truncated = read_body(response, body_read_limit()) if status == 200 else (b'', False)
+        return status, content_type, body, truncated
+    except Exception as e:
+        timed_out = is_timeout_error(e)
+        raise
+    finally:
+        if timings is not None:
+            timings.update(http_pool.last_timings())
+            timings['total'] = time.perf_counter() - started
+        if _host_limiter:
+            _host_limiter.release(host, status, timed_out, retry_after)
+
+async def fetch_probe_async(session, check_url, timings=None):
+    """Асинхронный вариант fetch_probe на общей aiohttp-сессии"""
+    host = urlparse(check_url).netloc
+    if _host_limiter:
+        await _host_limiter.acquire_async(host)
+    status, timed_out, retry_after = None, False, None
+    started = time.perf_counter()
+    scan_log.count(scan_log.REQUESTS)
+    if timings is not None:
+        timings.update(dns=None, connect=None)
+    try:
+        async with session.get(check_url, timeout=aiohttp.ClientTimeout(total=10),
+                               trace_request_ctx=timings) as response:
+            if timings is not None:
+                timings['ttfb'] = time.perf_counter() - started
+            status = response.status
+            retry_after = host_limiter.parse_retry_after(response.headers.get('retry-after'))
+            content_type = response.headers.get('content-type', '')
+            body, truncated = await read_body_async(response, body_read_limit()) if status == 200 else (b'', False)
+        return status, content_type, body, truncated
+    except Exception as e:
+        timed_out = is_timeout_error(e)
+        raise
+    finally:
+        if timings is not None:
+            timings['total'] = time.perf_counter() - started
+        if _host_limiter:
+            _host_limiter.release(host, status, timed_out, retry_after)
+
+def baseline_hit(probe):
+    """Тело baseline-ответа, если он выглядит как валидный эндпоинт, иначе None"""
+    if isinstance(probe, Exception):
+        return None
+    status, content_type, body, truncated = probe
+    return body if is_probe_hit(status, content_type, body, truncated) else None
+
+def finish_baseline(host, probes):
+    if _catch_all.set_baseline(host, [baseline_hit(probe) for probe in probes]):
+        thread_safe_print(f"\n[CATCH-ALL] {host} отвечает валидным JSON на случайные пути — эндпоинты хоста пропускаются", scan_log.QUIET)
+
+def host_accepts_probes(url):
+    """Снимает baseline хоста при первом обращении; False — хост catch-all, проверять нечего"""
+    host = urlparse(url).netloc
+    if _catch_all.claim(host):
+        probes = []
+        for probe_url in _catch_all.baseline_urls(url):
+            try:
+                probes.append(fetch_probe(probe_url))
+            except Exception as e:
+                probes.append(e)
+        finish_baseline(host, probes)
+    else:
+        _catch_all.wait(host)
+    if _catch_all.is_catch_all(host):
+        _catch_all.record_skipped()
+        return False
+    return True
+
+async def host_accepts_probes_async(session, url):
+    """Асинхронный вариант host_accepts_probes"""
+    host = urlparse(url).netloc
+    if _catch_all.claim(host):
+        probes = await asyncio.gather(*(fetch_probe_async(session, probe_url)
+                                        for probe_url in _catch_all.baseline_urls(url)),
+                                      return_exceptions=True)
+        finish_baseline(host, probes)
+    else:
+        await _catch_all.wait_async(host)
+    if _catch_all.is_catch_all(host):
+        _catch_all.record_skipped()
+        return False
+    return True
+
+def error_class(error):
+    """Имя класса исходной ошибки под обёртками requests/urllib3 (NameResolutionError, ...)"""
+    while True:
+        inner = getattr(error, 'reason', None)
+        if not isinstance(inner, BaseException) and error.args and isinstance(error.args[0], BaseException):
+            inner = error.args[0]
+        if not isinstance(inner, BaseException):
+            return type(error).__name__
+        error = inner
+
+def format_timings(timings):
+    return " ".join(f"{key}={timings[key] * 1000:.1f}ms" for key in ("dns", "connect", "ttfb", "total")
+                    if timings.get(key) is not None)
+
+def log_probe(endpoint, check_url, timings, probe=None, hit=False, error=None):
+    """Пишет JSONL-запись о запросе (--jsonl); с -v печатает тайминги"""
+    if timings and scan_log.enabled(scan_log.VERBOSE):
+        thread_safe_print(f"[TIME] {check_url} {format_timings(timings)}", scan_log.VERBOSE)
+    if not _probe_log:
+        return
+    status, content_type, body, truncated = probe or (None, None, b'', False)
+    read = status == 200
+    record = {
+        "url": check_url,
+        "endpoint": endpoint[0],
+        "source": endpoint[3] if len(endpoint) > 3 else None,
+        "method": "GET",
+        "status": status,
+        "content_type": content_type or None,
+        "size": len(body) if read else None,
+        "truncated": truncated,
+        "sha1": hashlib.sha1(body).hexdigest() if read else None,
+        "hit": hit,
+        "error": error_class(error) if error else None,
+    }
+    for key in ("dns", "connect", "ttfb", "total"):
+        value = (timings or {}).get(key)
+        record[f"{key}_ms"] = round(value * 1000, 2) if value is not None else None
+    _probe_log.write(json.dumps(record, ensure_ascii=False))
+
+def check_single_endpoint(url_methods_pair):
+    """Проверяет один эндпоинт на доступность с JSON ответом"""
+    url, methods = url_methods_pair[:2]
+    valid_endpoints = []
+    
+    if "get" in methods and (_catch_all is None or host_accepts_probes(url)):
+        for check_url in build_urls_to_check(url_methods_pair):
+            timings = {} if _probe_log or scan_log.enabled(scan_log.VERBOSE) else None
+            try:
+                probe = fetch_probe(check_url, timings)
+                hit = report_probe(check_url, *probe)
+                if hit:
+                    valid_endpoints.append(check_url)
+                log_probe(url_methods_pair, check_url, timings, probe, hit)
+            except Exception as e:
+                scan_log.count(scan_log.ERRORS)
+                if not is_timeout_error(e):
+                    thread_safe_print(f"[ERR] {check_url} → {e}")
+                log_probe(url_methods_pair, check_url, timings, error=e)
+    
+    return valid_endpoints
+
+async def check_single_endpoint_async(session, url_methods_pair):
+    """Асинхронный вариант check_single_endpoint на общей aiohttp-сессии"""
+    url, methods = url_methods_pair[:2]
+    valid_endpoints = []
+    
+    if "get" in methods and (_catch_all is None or await host_accepts_probes_async(session, url)):
+        for check_url in build_urls_to_check(url_methods_pair):
+            timings = {} if _probe_log or scan_log.enabled(scan_log.VERBOSE) else None
+            try:
+                probe = await fetch_probe_async(session, check_url, timings)
+                hit = report_probe(check_url, *probe)
+                if hit:
+                    valid_endpoints.append(check_url)
+                log_probe(url_methods_pair, check_url, timings, probe, hit)
+            except Exception as e:
+                scan_log.count(scan_log.ERRORS)
+                if not is_timeout_error(e):
+                    thread_safe_print(f"[ERR] {check_url} → {e}")
+                log_probe(url_methods_pair, check_url, timings, error=e)
+    
+    return valid_endpoints
+
+def make_aiohttp_session(concurrency, per_host=None):
+    """aiohttp-сессия для async-движка (статистика соединений — в http_pool)"""
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host or 0, ssl=False)
+    return aiohttp.ClientSession(headers=HEADERS, connector=connector,
+                                 trace_configs=[http_pool.aiohttp_trace_config()])
+
+# === Потоковый конвейер: разбор спецификаций → очередь → проверка ===
+class ScanJournal:
+    """Журнал выполненной работы (JSONL, только дозапись) для --resume
+    
+    {"type": "source", "url": ..., "endpoints": [[url, methods, params, source], ...]} — источник разобран
+        (пишется только для источников с эндпоинтами: пустой результат может быть
+        таймаутом или обрывом соединения, и при --resume такой источник пробуем снова)
+    {"type": "probe", "url": ..., "hits": [...]}                        — эндпоинт проверен
+    """
+    
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.sources = {}   # url источника -> эндпоинты
+        self.probed = {}    # url эндпоинта -> подтверждённые URL
+        if resume:
+            self._load()
+        self._writer = BatchedLineWriter(path, mode="a" if resume else "w")
+    
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # недописанная строка после падения
+                    if record.get("type") == "source":
+                        self.sources[record["url"]] = [Endpoint(*e) for e in record["endpoints"]]
+                    elif record.get("type") == "probe":
+                        self.probed[record["url"]] = record["hits"]
+        except FileNotFoundError:
+            return
+        # Обрезаем недописанную последнюю строку, иначе новая запись склеится с ней
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+    
+    def hits(self):
+        """Все подтверждённые URL из журнала (для восстановления итогового файла)"""
+        return [url for hits in self.probed.values() for url in hits]
+    
+    def wrap_sources(self, sources):
+        """Уже разобранные источники не скачиваем повторно — берём эндпоинты из журнала"""
+        return [(partial(self.sources.get) if url in self.sources else loader, url)
+                for loader, url in sources]
+    
+    def record_source(self, url, endpoints):
+        self._writer.write(json.dumps({"type": "source", "url": url, "endpoints": endpoints}))
+    
+    def record_probe(self, url, hits):
+        self._writer.write(json.dumps({"type": "probe", "url": url, "hits": hits}))
+    
+    def close(self):
+        self._writer.close()
+
+class ResultWriter:
+    """Дописывает подтверждённые эндпоинты в файл сразу после проверки"""
+    
+    def __init__(self, path, journal=None):
+        self.path = path
+        self.journal = journal
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "w")
+        if journal:
+            self.write(journal.hits())
+    
+    def record(self, endpoint, urls):
+        """Записывает результат проверки эндпоинта (и отмечает его в журнале)"""
+        self.write(urls)
+        if self.journal:
+            self.journal.record_probe(endpoint[0], urls)
+    
+    def write(self, urls):
+        if not urls:
+            return
+        with self._lock:
+            for url in urls:
+                self._file.write(url + "\n")
+            self._file.flush()
+            self.count += len(urls)
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def produce_endpoints(sources, endpoint_queue, discovery_workers, journal=None):
+    """Разбирает источники и кладёт эндпоинты в очередь; возвращает число эндпоинтов"""
+    produced = 0
+    produced_lock = threading.Lock()
+    
+    def produce(loader, url):
+        nonlocal produced
+        endpoints = loader(url)
+        if journal:
+            if endpoints and url not in journal.sources:
+                journal.record_source(url, endpoints)
+            endpoints = [e for e in endpoints if e[0] not in journal.probed]
+        with produced_lock:
+            produced += len(endpoints)
+        for endpoint in endpoints:
+            endpoint_queue.put(endpoint)  # блокируется, если проверка не успевает
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, discovery_workers)) as executor:
+            futures = [executor.submit(produce, loader, url) for loader, url in sources]
+            # Ошибки — в порядке источников; эндпоинты уходят в очередь по мере разбора
+            for (loader, url), future in zip(sources, futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    thread_safe_print(f"[ERR] Ошибка при обработке {url}: {e}")
+    finally:
+        endpoint_queue.close()
+    return produced
+
+def consume_endpoints_threaded(endpoint_queue, emit, max_threads, stop=None):
+    """Потоки-проверяльщики: берут эндпоинты из очереди, пока она не закрыта и не пуста;
+    для каждого проверенного эндпоинта вызывается emit(эндпоинт, подтверждённые URL).
+    После stop.set() эндпоинты только вычитываются из очереди, без запросов."""
+    def worker():
+        while True:
+            endpoint = endpoint_queue.get()
+            if endpoint is None:
+                return
+            if stop is not None and stop.is_set():
+                continue
+            try:
+                emit(endpoint, check_single_endpoint(endpoint))
+            except Exception as e:
+                thread_safe_print(f"[ERR] Ошибка при обработке {endpoint}: {e}")
+    
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, max_threads))]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+async def consume_endpoints_async(endpoint_queue, emit, concurrency, per_host=None, stop=None):
+    """Async-проверка эндпоинтов из потоковой очереди в одном event loop (stop — как у threaded)"""
+    loop = asyncio.get_running_loop()
+    async_queue = asyncio.Queue(maxsize=max(1, concurrency) * 2)
+    
+    async def bridge():
+        # Переносим эндпоинты из потоковой очереди производителей в asyncio.Queue
+        while True:
+            endpoint = await loop.run_in_executor(None, endpoint_queue.get)
+            await async_queue.put(endpoint)
+            if endpoint is None:
+                return
+    
+    async with make_aiohttp_session(concurrency, per_host) as session:
+        async def worker():
+            while True:
+                endpoint = await async_queue.get()
+                if endpoint is None:
+                    await async_queue.put(None)  # оставляем признак конца остальным
+                    return
+                if stop is not None and stop.is_set():
+                    continue  # дочитываем очередь до конца, иначе bridge повиснет на put()
+                try:
+                    emit(endpoint, await check_single_endpoint_async(session, endpoint))
+                except Exception as e:
+                    thread_safe_print(f"[ERR] Ошибка при обработке {endpoint}: {e}")
+        
+        await asyncio.gather(bridge(), *(worker() for _ in range(max(1, concurrency))))
+
+# === API: discover() → probe() — потоковый конвейер без файлов и подпроцессов ===
+ProbeResult = namedtuple('ProbeResult', ['endpoint', 'hits'])
+
+def read_sources(path):
+    """URL источников из файла; поддерживаются два формата строк:
+    1. Новый: просто URL на строке (https://host/path/swagger.json)
+    2. Старый: [swagger-api] [http] [info] https://host/path (вывод nuclei)
+    """
+    urls = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("[swagger-api]"):
+                parts = line.split()
+                if len(parts) >= 4:
+                    urls.append(parts[3])
+            elif line.startswith("http://") or line.startswith("https://"):
+                # Берём первое слово, остальное — комментарий
+                urls.append(line.split()[0])
+    return urls
+
+def split_sources(urls):
+    """Делит URL на прямые ссылки на спецификации и Swagger UI URLs (требуют перебора путей)"""
+    direct_spec_urls, swagger_ui_urls = [], []
+    for url in urls:
+        (direct_spec_urls if is_direct_spec_url(url) else swagger_ui_urls).append(url)
+    return direct_spec_urls, swagger_ui_urls
+
+def drain_endpoints(endpoint_queue):
+    """Фоном разбирает очередь брошенного итератора, чтобы производители не повисли на put()"""
+    def drain():
+        while endpoint_queue.get() is not None:
+            pass
+    threading.Thread(target=drain, daemon=True).start()
+
+def feed_endpoints(endpoints, endpoint_queue, stop=None):
+    """Перекладывает эндпоинты из итератора в очередь проверки и закрывает её"""
+    try:
+        for endpoint in endpoints:
+            if stop is not None and stop.is_set():
+                # Генератор-источник (discover()) закрываем сразу, чтобы он остановил разбор
+                if hasattr(endpoints, 'close'):
+                    endpoints.close()
+                break
+            endpoint_queue.put(endpoint)  # блокируется, если проверка не успевает
+    except Exception as e:
+        thread_safe_print(f"[ERR] Ошибка при чтении эндпоинтов: {e}", scan_log.QUIET)
+    finally:
+        endpoint_queue.close()
+
+async def feed_endpoints_async(endpoints, endpoint_queue):
+    """feed_endpoints для асинхронного итератора"""
+    loop = asyncio.get_running_loop()
+    try:
+        async for endpoint in endpoints:
+            await loop.run_in_executor(None, endpoint_queue.put, endpoint)
+    finally:
+        endpoint_queue.close()
+
+def discover(sources, workers=1, race_width=0, journal=None, queue_size=1000):
+    """Итератор эндпоинтов (spec_index.Endpoint) по мере разбора спецификаций
+    
+    sources — URL Swagger UI и прямые ссылки на JSON/YAML-спецификации (как в
+    swagger_endpoints.txt, см. read_sources); прямые ссылки разбираются первыми,
+    workers источников — одновременно. С journal уже разобранные источники берутся
+    из журнала, а проверенные эндпоинты пропускаются.
+    """
+    direct_spec_urls, swagger_ui_urls = split_sources(sources)
+    loaders = build_sources(direct_spec_urls, swagger_ui_urls, race_width)
+    if journal:
+        loaders = journal.wrap_sources(loaders)
+    endpoint_queue = HostScheduler(host_of, maxsize=queue_size)
+    threading.Thread(target=produce_endpoints, args=(loaders, endpoint_queue, workers, journal),
+                     daemon=True).start()
+    try:
+        while True:
+            endpoint = endpoint_queue.get()
+            if endpoint is None:
+                return
+            yield endpoint
+    finally:
+        drain_endpoints(endpoint_queue)
+
+def probe(endpoints, workers=1, engine='threads', per_host=None, queue_size=1000):
+    """Итератор ProbeResult(эндпоинт, подтверждённые URL) по мере проверки
+    
+    endpoints — любой итерируемый объект эндпоинтов, в том числе discover(): он
+    читается в отдельном потоке, так что разбор и проверка идут одновременно.
+    Эндпоинты проходят через очередь с разбивкой по хостам (HostScheduler):
+    воркеры берут эндпоинты хостов со свободным окном по кругу. engine —
+    'threads' (workers потоков) или 'async' (aiohttp, workers одновременных запросов).
+    """
+    if engine == 'async' and aiohttp is None:
+        raise RuntimeError("Для engine='async' нужен aiohttp: pip install aiohttp")
+    endpoint_queue = HostScheduler(host_of, _host_limiter, maxsize=queue_size)
+    results = queue.SimpleQueue()
+    stop = threading.Event()
+    
+    def emit(endpoint, hits):
+        results.put(ProbeResult(endpoint, hits))
+    
+    def consume():
+        try:
+            if engine == 'async':
+                asyncio.run(consume_endpoints_async(endpoint_queue, emit, workers, per_host, stop))
+            else:
+                consume_endpoints_threaded(endpoint_queue, emit, workers, stop)
+        except BaseException as e:
+            results.put(e)
+        finally:
+            results.put(None)
+    
+    threading.Thread(target=feed_endpoints, args=(endpoints, endpoint_queue, stop), daemon=True).start()
+    threading.Thread(target=consume, daemon=True).start()
+    try:
+        while True:
+            result = results.get()
+            if result is None:
+                return
+            if isinstance(result, BaseException):
+                raise result
+            yield result
+    finally:
+        # Брошенный итератор: воркеры больше не проверяют, очередь вычитывается без запросов
+        stop.set()
+        drain_endpoints(endpoint_queue)
+
+async def probe_async(endpoints, concurrency=5, per_host=None, queue_size=1000):
+    """Асинхронный вариант probe для встраивания в свой event loop (aiohttp)
+    
+    endpoints — обычный (например, discover()) или асинхронный итерируемый объект.
+    """
+    if aiohttp is None:
+        raise RuntimeError("Для probe_async нужен aiohttp: pip install aiohttp")
+    loop = asyncio.get_running_loop()
+    endpoint_queue = HostScheduler(host_of, _host_limiter, maxsize=queue_size)
+    results = asyncio.Queue()
+    stop = threading.Event()
+    
+    def emit(endpoint, hits):
+        results.put_nowait(ProbeResult(endpoint, hits))
+    
+    if hasattr(endpoints, '__aiter__'):
+        feeder = asyncio.ensure_future(feed_endpoints_async(endpoints, endpoint_queue))
+    else:
+        feeder = loop.run_in_executor(None, feed_endpoints, endpoints, endpoint_queue, stop)
+    consumer = asyncio.ensure_future(consume_endpoints_async(endpoint_queue, emit, concurrency, per_host, stop))
+    consumer.add_done_callback(lambda _: results.put_nowait(None))
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            yield result
+        await consumer  # пробрасываем исключение воркеров, если было
+    finally:
+        stop.set()
+        feeder.cancel()
+        if not consumer.done():
+            consumer.cancel()
+            drain_endpoints(endpoint_queue)
+
+# === Шардирование: N процессов / машин делят один swagger_endpoints.txt ===
+SOURCES_FILE = "swagger_endpoints.txt"
+RESULTS_FILE = "swagger_get_200.txt"
+
+def parse_shard(value):
+    """'i/N' (0 <= i < N) -> (i, N) для argparse"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("ожидается I/N, например 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError("нужно 0 <= I < N")
+    return index, count
+
+def shard_of(url, count):
+    """Стабильный номер шарда источника: по хосту, чтобы хост целиком попадал в один процесс
+    (лимиты на хост, catch-all baseline и keep-alive остаются точными)"""
+    key = urlparse(url).netloc.lower() or url
+    return int.from_bytes(hashlib.sha1(key.encode('utf-8')).digest()[:8], 'big') % count
+
+def shard_path(path, shard):
+    """swagger_get_200.txt -> swagger_get_200.shard0of4.txt"""
+    if not shard:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard{shard[0]}of{shard[1]}{ext}"
+
+def merge_shards(count, jsonl_path=None, results_path=RESULTS_FILE):
+    """Объединяет результаты шардов в results_path (и JSONL): без повторов, в отсортированном порядке"""
+    outputs = [(results_path, True)] + ([(jsonl_path, False)] if jsonl_path else [])
+    missing = []
+    merged = 0
+    for path, dedup in outputs:
+        lines = []
+        for index in range(count):
+            part = shard_path(path, (index, count))
+            try:
+                with open(part, encoding="utf-8") as f:
+                    lines.extend(line.rstrip("\n") for line in f if line.strip())
+            except FileNotFoundError:
+                missing.append(part)
+        lines = sorted(set(lines)) if dedup else sorted(lines)
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in lines)
+        if dedup:
+            merged = len(lines)
+    return merged, missing
+
+def worker_argv(argv):
+    """Аргументы для дочернего процесса --workers: без --workers/--merge, без строки прогресса"""
+    result, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in ('--workers', '--merge'):
+            skip = True
+        elif not arg.startswith(('--workers=', '--merge=')):
+            result.append(arg)
+    return result + ['--no-progress']
+
+def run_workers(count, argv):
+    """Запускает count процессов этого же скрипта с --shard i/count; возвращает коды выхода"""
+    script = os.path.abspath(__file__)
+    processes = [subprocess.Popen([sys.executable, script, *worker_argv(argv), '--shard', f'{index}/{count}'])
+                 for index in range(count)]
+    return [process.wait() for process in processes]
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Swagger Endpoints Checker')
+    parser.add_argument('-i', '--input', default=SOURCES_FILE,
+                       help=f'Файл со ссылками на Swagger UI / спецификации (по умолчанию: {SOURCES_FILE})')
+    parser.add_argument('-o', '--output', default=RESULTS_FILE,
+                       help=f'Файл для подтверждённых GET эндпоинтов (по умолчанию: {RESULTS_FILE})')
+    parser.add_argument('-t', '--threads', type=int, default=1, 
+                       help='Количество потоков для проверки эндпоинтов (по умолчанию: 1)')
+    parser.add_argument('--pool-per-host', type=int, default=None,
+                       help='Максимум keep-alive соединений на один хост (по умолчанию: как -t, не меньше 10)')
+    parser.add_argument('--pool-hosts', type=int, default=http_pool.DEFAULT_MAX_HOSTS,
+                       help=f'Сколько пулов хостов держать открытыми одновременно (по умолчанию: {http_pool.DEFAULT_MAX_HOSTS})')
+    parser.add_argument('-dt', '--discovery-threads', type=int, default=None,
+                       help='Количество потоков для поиска и разбора спецификаций (по умолчанию: как -t)')
+    parser.add_argument('--race', type=int, default=0, metavar='N',
+                       help='Проверять кандидатов generate_swagger_urls параллельно (N одновременно) — '
+                            'побеждает первая найденная спецификация (по умолчанию: 0, по очереди)')
+    parser.add_argument('--cache-dir', default=spec_cache.DEFAULT_CACHE_DIR,
+                       help=f'Папка кэша спецификаций (по умолчанию: {spec_cache.DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Не использовать кэш спецификаций')
+    parser.add_argument('--cache-max-age', type=int, default=spec_cache.DEFAULT_MAX_AGE_DAYS,
+                       help=f'Удалять из кэша записи, не использованные N дней (по умолчанию: {spec_cache.DEFAULT_MAX_AGE_DAYS})')
+    parser.add_argument('--cache-max-mb', type=int, default=spec_cache.DEFAULT_MAX_MB,
+                       help=f'Максимальный размер кэша в МБ (по умолчанию: {spec_cache.DEFAULT_MAX_MB})')
+    parser.add_argument('--dead-ttl', type=int, default=spec_cache.DEFAULT_DEAD_TTL_HOURS,
+                       help=f'Сколько часов не перепроверять кандидатов, ответивших 404 или не-спецификацией '
+                            f'(по умолчанию: {spec_cache.DEFAULT_DEAD_TTL_HOURS})')
+    parser.add_argument('--queue-size', type=int, default=1000,
+                       help='Размер очереди эндпоинтов между разбором спецификаций и проверкой (по умолчанию: 1000)')
+    parser.add_argument('--journal', default='swagger_checker.journal',
+                       help='Журнал выполненной работы для --resume (по умолчанию: swagger_checker.journal)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Продолжить прерванный запуск: пропустить источники и эндпоинты из журнала')
+    parser.add_argument('--no-journal', action='store_true',
+                       help='Не вести журнал (без возможности --resume)')
+    parser.add_argument('--host-rate', type=float, default=host_limiter.DEFAULT_RATE,
+                       help=f'Максимум запросов в секунду на один хост при проверке (по умолчанию: {host_limiter.DEFAULT_RATE:g}, 0 — без лимита)')
+    parser.add_argument('--host-concurrency', type=int, default=host_limiter.DEFAULT_CONCURRENCY,
+                       help=f'Стартовое число параллельных запросов на хост (по умолчанию: {host_limiter.DEFAULT_CONCURRENCY})')
+    parser.add_argument('--host-max-concurrency', type=int, default=host_limiter.DEFAULT_MAX_CONCURRENCY,
+                       help=f'Максимум параллельных запросов на хост, до которого растёт окно (по умолчанию: {host_limiter.DEFAULT_MAX_CONCURRENCY})')
+    parser.add_argument('--no-host-limit', action='store_true',
+                       help='Не ограничивать нагрузку на хосты (как раньше: все -t потоки на любой хост)')
+    parser.add_argument('--jsonl', metavar='FILE',
+                       help='Писать в FILE JSONL-запись о каждом запросе: URL, спецификация, статус, '
+                            'Content-Type, размер и SHA-1 тела, тайминги dns/connect/ttfb/total, класс ошибки')
+    parser.add_argument('--no-catch-all', action='store_true',
+                       help='Не распознавать catch-all хосты (200 JSON на любой путь) и не схлопывать одинаковые ответы')
+    parser.add_argument('--max-body', type=int, default=DEFAULT_MAX_BODY,
+                       help=f'Сколько байт тела читать при проверке эндпоинта; большие ответы оцениваются '
+                            f'по началу (по умолчанию: {DEFAULT_MAX_BODY})')
+    parser.add_argument('--max-variants', type=int, default=param_synth.DEFAULT_MAX_VARIANTS,
+                       help=f'Сколько значений подставлять в один шаблонный путь ({{id}}, {{slug}}, ...) '
+                            f'(по умолчанию: {param_synth.DEFAULT_MAX_VARIANTS})')
+    parser.add_argument('--save-responses', metavar='DIR',
+                       help='Сохранять полные тела подтверждённых ответов в папку DIR')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads',
+                       help='Движок проверки: threads (ThreadPoolExecutor) или async (aiohttp, один event loop); '
+                            'для async -t задаёт число одновременных запросов (по умолчанию: threads)')
+    parser.add_argument('--shard', type=parse_shard, metavar='I/N',
+                       help='Обработать только шард I из N (0 <= I < N): источники делятся по стабильному хешу хоста; '
+                            'результаты пишутся в swagger_get_200.shardIofN.txt (имя — от -o)')
+    parser.add_argument('--workers', type=int, default=0, metavar='K',
+                       help='Запустить K процессов (каждый со своими -t потоками или event loop) '
+                            'с --shard 0/K..K-1/K и объединить их результаты')
+    parser.add_argument('--merge', type=int, metavar='N',
+                       help='Только объединить результаты N шардов в файл -o (после --shard на разных машинах)')
+    scan_log.add_arguments(parser)
+    
+    args = parser.parse_args()
+    scan_log.configure_from_args(args)
+    
+    if args.merge or args.workers > 1:
+        count = args.merge or args.workers
+        if args.workers > 1:
+            thread_safe_print(f"[CONFIG] Процессов: {args.workers}, в каждом потоков: {args.threads}")
+            failed = [code for code in run_workers(args.workers, sys.argv[1:]) if code]
+            if failed:
+                thread_safe_print(f"[WARNING] Процессов завершилось с ошибкой: {len(failed)}", scan_log.QUIET)
+        merged, missing = merge_shards(count, args.jsonl, args.output)
+        for path in missing:
+            thread_safe_print(f"[WARNING] Нет результатов шарда: {path}", scan_log.QUIET)
+        thread_safe_print(f"\n[RESULT] Объединено {count} шардов: {merged} валидных GET эндпоинтов", scan_log.QUIET)
+        thread_safe_print(f"[DONE] Результаты сохранены в {args.output}", scan_log.QUIET)
+        return
+    
+    if args.engine == 'async' and aiohttp is None:
+        thread_safe_print("[ERROR] Для --engine async нужен aiohttp: pip install aiohttp", scan_log.QUIET)
+        return
+    
+    thread_safe_print("=== Swagger Endpoints Checker ===")
+    thread_safe_print(f"[CONFIG] Потоков: {args.threads}")
+    thread_safe_print(f"[CONFIG] Движок: {args.engine}")
+    
+    discovery_threads = args.discovery_threads or args.threads
+    thread_safe_print(f"[CONFIG] Потоков поиска спецификаций: {discovery_threads}")
+    if args.race > 1:
+        thread_safe_print(f"[CONFIG] Гонка кандидатов спецификации: по {args.race} одновременно")
+    
+    pool_per_host = args.pool_per_host or max(args.threads, discovery_threads, http_pool.DEFAULT_PER_HOST)
+    http_pool.configure(per_host=pool_per_host, max_hosts=args.pool_hosts)
+    thread_safe_print(f"[CONFIG] Пул соединений: {pool_per_host} на хост, до {args.pool_hosts} хостов")
+    
+    try:
+        source_urls = read_sources(args.input)
+    except FileNotFoundError:
+        thread_safe_print(f"[ERROR] Файл {args.input} не найден!", scan_log.QUIET)
+        return
+
+    if args.shard:
+        source_urls = [url for url in source_urls if shard_of(url, args.shard[1]) == args.shard[0]]
+        thread_safe_print(f"[CONFIG] Шард {args.shard[0]}/{args.shard[1]}")
+    direct_spec_urls, swagger_ui_urls = split_sources(source_urls)
+    thread_safe_print(f"[INFO] Прямых ссылок на спецификации: {len(direct_spec_urls)}")
+    thread_safe_print(f"[INFO] Swagger UI URLs (перебор путей): {len(swagger_ui_urls)}")
+
+    configure_probe(args.max_body, args.save_responses, max(1, args.max_variants))
+    if args.save_responses:
+        thread_safe_print(f"[CONFIG] Тела подтверждённых ответов сохраняются в {args.save_responses}")
+
+    if not args.no_host_limit:
+        set_host_limiter(HostLimiter(args.host_rate, args.host_concurrency, args.host_max_concurrency))
+        thread_safe_print(f"[CONFIG] Лимит на хост: {args.host_rate:g} запросов/с, окно {args.host_concurrency}"
+              f"..{args.host_max_concurrency} параллельных (AIMD, откат на 429/503/таймаутах)")
+
+    if args.jsonl:
+        set_probe_log(BatchedLineWriter(shard_path(args.jsonl, args.shard), mode="w"))
+        thread_safe_print(f"[CONFIG] JSONL-лог запросов: {shard_path(args.jsonl, args.shard)}")
+
+    if not args.no_catch_all:
+        set_catch_all_detector(catch_all.CatchAllDetector())
+        thread_safe_print(f"[CONFIG] Catch-all хосты распознаются по {catch_all.BASELINE_PROBES} случайным путям")
+
+    if not args.no_cache:
+        set_spec_cache(SpecCache(args.cache_dir, args.cache_max_age, args.cache_max_mb, args.dead_ttl))
+        thread_safe_print(f"[CONFIG] Кэш спецификаций: {args.cache_dir}")
+
+    # Разбор спецификаций (прямые JSON-спецификации, затем Swagger UI URLs) и проверка
+    # эндпоинтов идут одновременно: discover() отдаёт эндпоинты по мере разбора, probe()
+    # проверяет их, подтверждённые дописываются в файл -o (или файл шарда) сразу
+    journal = None
+    if not args.no_journal:
+        journal = ScanJournal(shard_path(args.journal, args.shard), resume=args.resume)
+        if args.resume:
+            thread_safe_print(f"[RESUME] Из журнала {journal.path}: источников {len(journal.sources)}, "
+                  f"проверенных эндпоинтов {len(journal.probed)}, найдено {len(journal.hits())}")
+    results_path = shard_path(args.output, args.shard)
+    writer = ResultWriter(results_path, journal)
+    total_endpoints = 0
+
+    def discovered():
+        nonlocal total_endpoints
+        for endpoint in discover(source_urls, discovery_threads, args.race, journal, args.queue_size):
+            total_endpoints += 1
+            yield endpoint
+
+    thread_safe_print(f"\n[INFO] Проверяем эндпоинты по мере разбора спецификаций "
+                      f"({args.engine}, {args.threads} одновременно, очередь {args.queue_size})...")
+    try:
+        for result in probe(discovered(), args.threads, args.engine, pool_per_host, args.queue_size):
+            writer.record(result.endpoint, result.hits)
+    finally:
+        writer.close()
+        if journal:
+            journal.close()
+        if _probe_log:
+            _probe_log.close()
+            set_probe_log(None)
+        if _spec_cache:
+            thread_safe_print(f"[INFO] Спецификаций из кэша (304 Not Modified): {_spec_cache.hits}")
+            thread_safe_print(f"[INFO] Пропущено мёртвых кандидатов: {_spec_cache.skipped_candidates}")
+            _spec_cache.close()
+            set_spec_cache(None)
+
+    thread_safe_print(f"\n[INFO] Всего извлечено {total_endpoints} эндпоинтов из {len(source_urls)} источников")
+    
+    if total_endpoints or writer.count:
+        thread_safe_print(f"\n[RESULT] Найдено {writer.count} валидных GET эндпоинтов с JSON ответом", scan_log.QUIET)
+        thread_safe_print(f"\n[DONE] Результаты сохранены в {results_path}", scan_log.QUIET)
+        thread_safe_print(f"[STATS] Обработано: {total_endpoints} эндпоинтов")
+        thread_safe_print(f"[STATS] Валидных: {writer.count} GET эндпоинтов")
+        thread_safe_print(f"[STATS] Использовано потоков: {args.threads}")
+        thread_safe_print(f"[STATS] Соединения: {http_pool.format_stats()}")
+        if _host_limiter:
+            limits = _host_limiter.stats()
+            thread_safe_print(f"[STATS] Хостов: {limits['hosts']}, снижений окна (429/503/таймауты): {limits['backoffs']}")
+        if _catch_all:
+            fallback = _catch_all.stats()
+            thread_safe_print(f"[STATS] Catch-all хостов: {fallback['catch_all_hosts']}, пропущено эндпоинтов: {fallback['skipped']}, "
+                  f"отброшено как случайный путь: {fallback['rejected']}, повторов тела: {fallback['collapsed']}")
+    else:
+        thread_safe_print("[WARNING] Не найдено ни одного эндпоинта для проверки", scan_log.QUIET)
+
+if __name__ == "__main__":
+    main()
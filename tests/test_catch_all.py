@@ -0,0 +1,30 @@
+"""Тесты catch_all: baseline по случайным путям и схлопывание повторов"""
+
+import json
+
+import catch_all
+
+
+def detector_with_baseline(host, bodies):
+    detector = catch_all.CatchAllDetector()
+    assert detector.claim(host)
+    detector.set_baseline(host, bodies)
+    return detector
+
+
+def test_repeated_body_is_collapsed_but_does_not_mark_host_catch_all():
+    detector = detector_with_baseline("api", [None, None])
+    empty = json.dumps({"items": [], "total": 0}).encode()
+    verdicts = [detector.classify("api", f"http://api/empty{i}", empty)[0] for i in range(7)]
+    assert verdicts == [None] + [catch_all.VERDICT_DUPLICATE] * 6
+    for i in range(5):
+        body = json.dumps({"id": i, "name": f"user{i}"}).encode()
+        assert detector.classify("api", f"http://api/real{i}", body) == (None, None)
+    assert not detector.is_catch_all("api")
+
+
+def test_body_matching_baseline_is_rejected():
+    fallback = json.dumps({"status": "ok"}).encode()
+    detector = detector_with_baseline("spa", [fallback, None])
+    assert not detector.is_catch_all("spa")
+    assert detector.classify("spa", "http://spa/api/users", fallback) == (catch_all.VERDICT_BASELINE, None)
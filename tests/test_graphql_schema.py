@@ -0,0 +1,83 @@
+"""Tests for graphql_schema: best-first selection sets under a byte/field budget."""
+
+from graphql_schema import MAX_DEPTH, CompiledSchema
+
+SCALARS = {"ID", "String"}
+
+
+def obj(name, *fields):
+    return {"name": name, "kind": "OBJECT", "fields": [
+        {"name": field, "args": [],
+         "type": {"kind": "SCALAR" if type_name in SCALARS else "OBJECT", "name": type_name, "ofType": None}}
+        for field, type_name in fields
+    ]}
+
+
+def schema(*types):
+    scalars = [{"name": name, "kind": "SCALAR"} for name in sorted(SCALARS)]
+    return {"queryType": {"name": "Query"}, "types": [*types, *scalars]}
+
+
+def wide_type(count):
+    return obj("Wide", *[(f"f{i}", "String") for i in range(count)], ("ssn", "String"))
+
+
+def depth(selection):
+    level = deepest = 0
+    for char in selection:
+        level += char == "{"
+        level -= char == "}"
+        deepest = max(deepest, level)
+    return deepest
+
+
+def test_field_budget_keeps_best_scored_leaves_in_schema_order():
+    compiled = CompiledSchema(schema(obj("Query", ("w", "Wide")), wide_type(40)), max_fields=5,
+                              leaf_score=lambda name: 5.0 if name == "ssn" else 1.0)
+    assert compiled.selection("Wide") == "f0 f1 f2 f3 ssn"
+
+
+def test_byte_budget_truncates_selection():
+    compiled = CompiledSchema(schema(obj("Query", ("w", "Wide")), wide_type(40)), max_bytes=40)
+    selection = compiled.selection("Wide")
+    assert selection == "f0 f1 f2 f3 f4 f5 f6 f7 f8 f9 f10 f11"
+    assert len(selection) <= 40
+    # A larger per-call budget gives a longer (separately memoized) selection
+    assert len(compiled.selection("Wide", max_bytes=400)) > len(selection)
+
+
+def test_cycles_are_cut_on_the_current_path():
+    compiled = CompiledSchema(schema(
+        obj("Query", ("user", "User")),
+        obj("User", ("id", "ID"), ("name", "String"), ("friend", "User"), ("posts", "Post")),
+        obj("Post", ("id", "ID"), ("title", "String"), ("author", "User")),
+    ))
+    assert compiled.selection("User") == "id name posts { id title }"
+    assert compiled.selection("Query") == "user { id name posts { id title } }"
+
+
+def test_nesting_stops_at_max_depth():
+    types = [obj("Query", ("a", "A"))]
+    names = ["A", "B", "C", "D", "E", "F"]
+    for name, nested in zip(names, names[1:]):
+        types.append(obj(name, ("x", "String"), (nested.lower(), nested)))
+    types.append(obj("F", ("x", "String")))
+    selection = CompiledSchema(schema(*types)).selection("Query")
+    assert selection == "a { x b { x c { x } } }"
+    assert depth(selection) == MAX_DEPTH
+
+
+def test_high_scored_deep_leaf_wins_over_shallow_ones():
+    compiled = CompiledSchema(schema(
+        obj("Query", ("u", "User")),
+        obj("User", ("a", "String"), ("b", "String"), ("c", "String"), ("profile", "Profile")),
+        obj("Profile", ("email", "String")),
+    ), max_fields=3, leaf_score=lambda name: 5.0 if name == "email" else 1.0)
+    assert compiled.selection("User") == "a profile { email }"
+
+
+def test_scalar_types_have_no_selection_block():
+    compiled = CompiledSchema(schema(obj("Query", ("name", "String"))))
+    assert compiled.selection_block("String") == ""
+    assert compiled.selection("String") == "__typename"
+    assert compiled.operations[0]["selection"] == ""
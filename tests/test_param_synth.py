@@ -0,0 +1,23 @@
+"""Тесты param_synth: значения для шаблонных путей"""
+
+import param_synth
+
+
+def path_params(**params):
+    return {"path": [{"name": name, **param} for name, param in params.items()]}
+
+
+def test_enum_without_usable_values_falls_back_to_name_hints():
+    urls = param_synth.synthesize_urls("https://host/api/{x}", path_params(x={"enum": [None]}))
+    assert urls == [f"https://host/api/{v}" for v in param_synth._FALLBACK_VALUES]
+
+
+def test_template_without_values_next_to_one_with_values():
+    params = path_params(x={"enum": [None, {"a": 1}]}, y={"enum": ["a", "b"]})
+    urls = param_synth.synthesize_urls("https://host/api/{x}/{y}", params)
+    assert urls == ["https://host/api/1/a", "https://host/api/test/b"]
+
+
+def test_enum_is_a_closed_list():
+    urls = param_synth.synthesize_urls("https://host/api/{status}", path_params(status={"enum": ["open"]}))
+    assert urls == ["https://host/api/open"]
@@ -0,0 +1,53 @@
+"""Тесты spec_index: базовые URL из servers / host / basePath"""
+
+import datetime
+import json
+
+import param_synth
+import spec_index
+
+SPEC_URL = "https://docs.example.com/openapi.json"
+
+
+def openapi(servers):
+    return {"openapi": "3.0.0", "servers": servers, "paths": {}}
+
+
+def test_server_variable_default_and_enum_are_expanded():
+    spec = openapi([{
+        "url": "https://{region}.api.example.com/v1",
+        "variables": {"region": {"default": "eu", "enum": ["eu", "us"]}},
+    }])
+    assert spec_index.spec_bases(spec, SPEC_URL) == [
+        "https://eu.api.example.com/v1",
+        "https://docs.example.com/v1",
+        "https://us.api.example.com/v1",
+    ]
+
+
+def test_unresolved_server_variable_in_host_is_dropped():
+    spec = openapi([{"url": "https://{region}.api.example.com/v1"}])
+    bases = spec_index.spec_bases(spec, SPEC_URL)
+    assert bases == ["https://docs.example.com/v1"]
+    assert not any("{" in base for base in bases)
+
+
+def test_unresolved_server_variable_in_path_is_dropped():
+    spec = openapi([{"url": "https://api.example.com/{basePath}", "variables": {"basePath": {}}}])
+    assert spec_index.spec_bases(spec, SPEC_URL) == ["https://docs.example.com"]
+
+
+def test_param_values_are_json_scalars():
+    spec = openapi([{"url": "https://api.example.com"}])
+    spec["paths"] = {"/reports/{day}": {"get": {"parameters": [{
+        "name": "day", "in": "path", "required": True,
+        "schema": {"type": "string", "example": datetime.date(2024, 1, 1),
+                   "enum": [datetime.date(2024, 1, 1), datetime.date(2024, 2, 1), {"a": 1}, None]},
+    }]}}}
+    endpoint = spec_index.compile_spec(spec, SPEC_URL).endpoints()[0]
+    day = endpoint.params["path"][0]
+    assert day["enum"] == ["2024-01-01", "2024-02-01"]
+    assert day["example"] == "2024-01-01"
+    json.dumps(endpoint.params)
+    # enum остаётся закрытым списком: подставляются только его значения
+    assert param_synth.candidate_values("day", day) == ["2024-01-01", "2024-02-01"]
@@ -0,0 +1,74 @@
+"""Тесты swagger_checker: разбор YAML-спецификаций и кэш"""
+
+import json
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+import swagger_checker as sc
+from spec_cache import SpecCache
+
+pytestmark = pytest.mark.skipif(sc.yaml is None, reason="нужен PyYAML")
+
+SPEC_URL = "http://api.example.com/spec.yaml"
+YAML_SPEC = b"""\
+openapi: 3.0.0
+info: {title: dates, version: 1}
+servers:
+  - url: http://api.example.com
+paths:
+  /reports:
+    get:
+      parameters:
+        - name: day
+          in: query
+          required: true
+          schema: {type: string, format: date, example: 2024-01-01, enum: [2024-01-01, 2024-02-01]}
+      responses:
+        200: {description: ok}
+"""
+
+
+class FakeResponse:
+    status_code = 200
+    content = YAML_SPEC
+
+    def __init__(self):
+        self.headers = CaseInsensitiveDict({"ETag": '"v1"', "Content-Type": "application/yaml"})
+
+
+def test_yaml_dates_stay_strings():
+    data, spec_format = sc.parse_spec_document(YAML_SPEC)
+    assert spec_format == "yaml"
+    schema = data["paths"]["/reports"]["get"]["parameters"][0]["schema"]
+    assert schema["example"] == "2024-01-01"
+    assert schema["enum"] == ["2024-01-01", "2024-02-01"]
+    json.dumps(data)
+
+
+def test_yaml_spec_with_dates_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(sc.http_pool, "get", lambda url, **kwargs: FakeResponse())
+    cache = SpecCache(str(tmp_path))
+    sc.set_spec_cache(cache)
+    try:
+        endpoints = sc.load_direct_spec(SPEC_URL)
+    finally:
+        sc.set_spec_cache(None)
+    assert [e.url for e in endpoints] == ["http://api.example.com/reports"]
+    assert cache.get(SPEC_URL)["spec"]["paths"]
+
+
+def test_cache_write_error_does_not_drop_spec(tmp_path, monkeypatch):
+    monkeypatch.setattr(sc.http_pool, "get", lambda url, **kwargs: FakeResponse())
+    cache = SpecCache(str(tmp_path))
+
+    def broken_store(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cache, "store", broken_store)
+    sc.set_spec_cache(cache)
+    try:
+        endpoints = sc.load_direct_spec(SPEC_URL)
+    finally:
+        sc.set_spec_cache(None)
+    assert len(endpoints) == 1